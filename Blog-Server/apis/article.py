@@ -1,72 +1,127 @@
-from flask import Blueprint, request, jsonify
+import json
+from datetime import datetime
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from werkzeug.exceptions import RequestEntityTooLarge
 from models import db, Article, Tag, ArticleTag, Project, ProjectArticle, Comment
+from serializers import (
+    article_tags_for, serialize_archive, serialize_article, serialize_articles, serialize_hot_article
+)
+from services import archive as archive_service
+from services.importer import import_articles, iter_jsonl
+from services.render import render_markdown, apply_rendered, store_rendered
+from services.response_cache import response_cache, ARTICLES, TAGS, COMMENTS, PROJECTS
+from services.search import search_index
+from services.tags import adjust_published, remove_article_tags, set_article_tags
+from services.trending import trending
+from utils.http_cache import conditional, make_etag, is_not_modified, not_modified_response, set_validators
+from utils.fields import ARTICLE_DETAIL_FIELDS, ARTICLE_LIST_FIELDS, columns_for, parse_fields
+from utils.pagination import encode_cursor, seek_after, seek_after_row
+from utils.request_limits import request_too_large_response
 
 article_blueprint = Blueprint('article', __name__)
 
 
+def _sync_search_index(article, tag_names=None):
+    """文章写入后同步全文索引：已发布的重新索引，未发布的移出索引和热门排行"""
+    if not article.is_published:
+        search_index.remove_article(article.id)
+        trending.remove(article.id)
+        return
+
+    if tag_names is None:
+        tag_names = [name for (name,) in db.session.query(Tag.name)
+                     .join(ArticleTag).filter(ArticleTag.article_id == article.id).all()]
+    search_index.index_article(article.id, article.title, article.excerpt, article.content, tag_names)
+
+
+def _count_articles(query):
+    """统计查询命中的文章数（只计数ID，不加载任何列）"""
+    return query.with_entities(db.func.count(Article.id)).order_by(None).scalar()
+
+
 @article_blueprint.route('/get-page', methods=['GET'])
+@conditional
+@response_cache.cached(ARTICLES, TAGS, COMMENTS, PROJECTS)
 def get_articles():
-    """获取文章列表（分页）"""
+    """获取文章列表（分页，按响应体计算ETag，支持条件请求）
+
+    传入cursor参数（首页传空字符串）时使用游标分页：按(created_at, id)定位，
+    返回next_cursor，仅在with_total=true时统计总数。
+    fields为逗号分隔的返回字段，只查询需要的列，不含tags时不查询标签。
+    """
     try:
+        try:
+            fields = parse_fields(request.args.get('fields'), ARTICLE_LIST_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 5, type=int)
+        per_page = min(max(request.args.get('per_page', 5, type=int), 1), 100)
         tag = request.args.get('tag', '')
         archive = request.args.get('archive', '')
+        cursor = request.args.get('cursor')
+        with_total = request.args.get('with_total', 'false').lower() == 'true'
 
-        # 构建查询
-        query = Article.query.filter_by(is_published=True)
+        # 构建查询（只查询请求的字段，以及排序和游标需要的列，结果为行而不是ORM对象）
+        query = db.session.query(*columns_for(Article, fields, Article.id, Article.created_at)) \
+            .filter(Article.is_published.is_(True))
 
         # 按标签筛选
         if tag:
             query = query.join(ArticleTag).join(Tag).filter(Tag.name == tag)
 
-        # 按归档月份筛选
+        # 按归档月份筛选（转换为时间范围，可以使用created_at索引）
         if archive:
-            # 将"2025年11月"转换为"2025-11"格式进行查询
-            year_month = archive.replace('年', '-').replace('月', '')
-            query = query.filter(
-                db.func.DATE_FORMAT(Article.created_at, '%Y-%m') == year_month
+            try:
+                month_start, month_end = archive_service.month_range(archive)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            query = query.filter(Article.created_at >= month_start, Article.created_at < month_end)
+
+        # 游标分页：用索引定位代替OFFSET扫描，多取一条判断是否还有下一页
+        if cursor is not None:
+            total = _count_articles(query) if with_total else None
+
+            if cursor:
+                try:
+                    query = query.filter(seek_after(Article.created_at, Article.id, cursor))
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 400
+
+            items = query.order_by(Article.created_at.desc(), Article.id.desc()) \
+                .limit(per_page + 1) \
+                .all()
+            has_more = len(items) > per_page
+            items = items[:per_page]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+        else:
+            # 分页查询（总数单独用COUNT(id)统计，不把整行包进子查询）
+            pagination = query.order_by(Article.created_at.desc()).paginate(
+                page=page, per_page=per_page, error_out=False, count=False
             )
-
-        # 分页查询
-        pagination = query.order_by(Article.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-
-        # 批量获取标签，避免N+1查询问题
-        article_ids = [article.id for article in pagination.items]
-        article_tags = {}
-        if article_ids:
-            # 一次性获取所有文章的标签
-            tag_results = db.session.query(
-                ArticleTag.article_id,
-                Tag.name
-            ).join(Tag).filter(ArticleTag.article_id.in_(article_ids)).all()
-
-            for article_id, tag_name in tag_results:
-                if article_id not in article_tags:
-                    article_tags[article_id] = []
-                article_tags[article_id].append(tag_name)
-
-        articles = []
-        for article in pagination.items:
-            articles.append({
-                'id': article.id,
-                'title': article.title,
-                'excerpt': article.excerpt,
-                'read_time': article.read_time,
-                'view_count': article.view_count,
-                'like_count': article.like_count,
-                'comment_count': article.comment_count,
-                'created_at': article.created_at.strftime('%Y-%m-%d'),
-                'tags': article_tags.get(article.id, []),
-                'program_name': article.program_name
-            })
+            items = pagination.items
+            total = _count_articles(query)
+
+        # 需要标签时批量获取，避免N+1查询问题
+        article_tags = article_tags_for([article.id for article in items]) if 'tags' in fields else {}
+        articles = serialize_articles(items, fields, article_tags)
+
+        if cursor is not None:
+            result = {
+                'articles': articles,
+                'next_cursor': next_cursor,
+                'has_more': has_more
+            }
+            if with_total:
+                result['total'] = total
+            return jsonify(result)
 
         return jsonify({
             'articles': articles,
-            'total': pagination.total,
-            'pages': pagination.pages,
+            'total': total,
+            'pages': (total + per_page - 1) // per_page,
             'current_page': page
         })
 
@@ -76,42 +131,29 @@ def get_articles():
 
 @article_blueprint.route('/all-articles', methods=['GET'])
 def get_all_articles():
-    """获取所有文章（不分页，用于归档页面）"""
+    """获取所有文章（不分页，用于归档页面）
+
+    stream=true时分块读取并逐条输出JSON，内存占用不随文章数量增长。
+    fields为逗号分隔的返回字段（如归档页面只需要id,title,created_at）。
+    """
     try:
-        # 获取所有已发布文章
-        articles = Article.query.filter_by(is_published=True) \
+        try:
+            fields = parse_fields(request.args.get('fields'), ARTICLE_LIST_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if request.args.get('stream', 'false').lower() == 'true':
+            return Response(stream_with_context(_stream_all_articles(fields)), mimetype='application/json')
+
+        # 获取所有已发布文章（只查询需要的列）
+        articles = db.session.query(*columns_for(Article, fields, Article.id, Article.created_at)) \
+            .filter(Article.is_published.is_(True)) \
             .order_by(Article.created_at.desc()) \
             .all()
 
-        # 批量获取标签，避免N+1查询问题
-        article_ids = [article.id for article in articles]
-        article_tags = {}
-        if article_ids:
-            # 一次性获取所有文章的标签
-            tag_results = db.session.query(
-                ArticleTag.article_id,
-                Tag.name
-            ).join(Tag).filter(ArticleTag.article_id.in_(article_ids)).all()
-
-            for article_id, tag_name in tag_results:
-                if article_id not in article_tags:
-                    article_tags[article_id] = []
-                article_tags[article_id].append(tag_name)
-
-        articles_list = []
-        for article in articles:
-            articles_list.append({
-                'id': article.id,
-                'title': article.title,
-                'excerpt': article.excerpt,
-                'read_time': article.read_time,
-                'view_count': article.view_count,
-                'like_count': article.like_count,
-                'comment_count': article.comment_count,
-                'created_at': article.created_at.strftime('%Y-%m-%d'),
-                'tags': article_tags.get(article.id, []),
-                'program_name': article.program_name
-            })
+        # 需要标签时批量获取，避免N+1查询问题
+        article_tags = article_tags_for([article.id for article in articles]) if 'tags' in fields else {}
+        articles_list = serialize_articles(articles, fields, article_tags)
 
         return jsonify({
             'articles': articles_list,
@@ -122,47 +164,121 @@ def get_all_articles():
         return jsonify({'error': str(e)}), 500
 
 
+def _stream_all_articles(fields, chunk_size=500):
+    """按(created_at, id)分块读取已发布文章，每块批量获取标签后逐条输出JSON数组"""
+    yield '{"articles": ['
+
+    columns = columns_for(Article, fields, Article.id, Article.created_at)
+    total = 0
+    last_row = None
+    while True:
+        query = db.session.query(*columns).filter(Article.is_published.is_(True))
+        if last_row is not None:
+            query = query.filter(seek_after_row(Article.created_at, Article.id, last_row.created_at, last_row.id))
+        chunk = query.order_by(Article.created_at.desc(), Article.id.desc()).limit(chunk_size).all()
+        if not chunk:
+            break
+
+        # 每块最多一次标签查询
+        article_tags = article_tags_for([row.id for row in chunk]) if 'tags' in fields else {}
+
+        for row in chunk:
+            item = current_app.json.dumps(serialize_article(row, fields, article_tags))
+            yield item if total == 0 else ',' + item
+            total += 1
+
+        last_row = chunk[-1]
+        # 结束只读事务，避免长时间占用连接和快照
+        db.session.rollback()
+
+    yield f'], "total": {total}}}'
+
+
 @article_blueprint.route('/single/<int:article_id>', methods=['GET'])
 def get_article(article_id):
-    """获取单篇文章详情"""
-    try:
-        article = Article.query.get_or_404(article_id)
+    """获取单篇文章详情（支持ETag / Last-Modified条件请求）
 
-        return jsonify({
-            'id': article.id,
-            'title': article.title,
-            'content': article.content,
-            'excerpt': article.excerpt,
-            'read_time': article.read_time,
-            'view_count': article.view_count,
-            'like_count': article.like_count,
-            'comment_count': article.comment_count,
-            'created_at': article.created_at.strftime('%Y-%m-%d'),
-            'tags': [tag.name for tag in article.tags],
-            'program_name': article.program_name
-        })
+    format=html时返回写入时预渲染的HTML和目录（content_html、toc），不返回Markdown原文。
+    fields为逗号分隔的返回字段，可选列表字段以及word_count、content、content_html、toc。
+    """
+    try:
+        render_html = request.args.get('format', 'markdown') == 'html'
+        default_fields = ARTICLE_LIST_FIELDS + (('word_count', 'content_html', 'toc') if render_html
+                                                else ('word_count', 'content'))
+        try:
+            fields = parse_fields(request.args.get('fields'), ARTICLE_DETAIL_FIELDS, default_fields)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # 先只读取版本字段，客户端缓存仍然有效时不加载正文
+        version = db.session.query(
+            Article.updated_at,
+            Article.view_count,
+            Article.like_count,
+            Article.comment_count
+        ).filter(Article.id == article_id).first()
+        if version is None:
+            return jsonify({'error': '文章不存在'}), 404
+
+        etag = make_etag('article', article_id, ','.join(fields), *version)
+        if is_not_modified(etag, version.updated_at):
+            return not_modified_response(etag, version.updated_at)
+
+        # 返回渲染结果时同时加载content_html，用于判断是否需要补齐
+        render_fields = {'content_html', 'toc'} & set(fields)
+        required = (Article.id, Article.content_html) if render_fields else (Article.id,)
+        article = db.session.get(Article, article_id, options=[load_only(*columns_for(Article, fields, *required))])
+
+        backfilled = False
+        if render_fields and article.content_html is None:
+            # 迁移前创建、还没有运行db_migrate补齐渲染结果的文章，首次读取时补齐；
+            # updated_at保持不变，补齐前后的ETag和Last-Modified一致
+            rendered = render_markdown(article.content)
+            store_rendered(article.id, rendered)
+            for name in ('content_html', 'toc', 'word_count'):
+                set_committed_value(article, name, rendered[name])
+            backfilled = True
+
+        article_tags = article_tags_for([article.id]) if 'tags' in fields else {}
+        result = serialize_article(article, fields, article_tags)
+        if 'toc' in result:
+            result['toc'] = json.loads(result['toc'] or '[]')
+        if backfilled:
+            db.session.commit()
+
+        response = jsonify(result)
+        return set_validators(response, etag, version.updated_at)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @article_blueprint.route('/create', methods=['POST'])
+@response_cache.invalidates(ARTICLES, TAGS, PROJECTS)
 def create_article():
     """创建新文章"""
     try:
         data = request.get_json()
 
+        # 渲染Markdown，未填写摘要和阅读时间时使用自动计算的结果
+        rendered = render_markdown(data['content'])
+
         # 创建文章
         article = Article(
             title=data['title'],
             content=data['content'],
-            excerpt=data.get('excerpt', ''),
-            read_time=data.get('read_time', 5),  # 默认5分钟
+            excerpt=data.get('excerpt') or rendered['excerpt'],
+            read_time=data.get('read_time') or rendered['read_time'],
             is_published=data.get('is_published', True)
         )
+        apply_rendered(article, rendered)
 
         db.session.add(article)
-        db.session.flush()  # 获取article.id
+        db.session.flush()  # 获取article.id和created_at
+
+        # 同步月度归档
+        if article.is_published:
+            archive_service.adjust(article.created_at, 1)
 
         # 处理项目关联
         if 'program_id' in data and data['program_id']:
@@ -174,21 +290,18 @@ def create_article():
                 db.session.add(project_article)
                 # 设置文章的项目名称
                 article.program_name = program.name
+                program.updated_at = datetime.utcnow()
 
-        # 处理标签
+        # 处理标签：批量解析标签并一次写入所有关联
+        tag_names = []
         if 'tags' in data:
-            for tag_name in data['tags']:
-                tag = Tag.query.filter_by(name=tag_name).first()
-                if not tag:
-                    tag = Tag(name=tag_name)
-                    db.session.add(tag)
-                    db.session.flush()
-
-                article_tag = ArticleTag(article_id=article.id, tag_id=tag.id)
-                db.session.add(article_tag)
+            tag_names, _ = set_article_tags(article.id, data['tags'], is_new=True,
+                                            published=article.is_published)
 
         db.session.commit()
 
+        _sync_search_index(article, tag_names)
+
         return jsonify({
             'message': '文章创建成功',
             'article_id': article.id
@@ -199,7 +312,41 @@ def create_article():
         return jsonify({'error': str(e)}), 500
 
 
+@article_blueprint.route('/bulk-create', methods=['POST'])
+@response_cache.invalidates(ARTICLES, TAGS, PROJECTS)
+def bulk_create_articles():
+    """批量导入文章
+
+    请求体可以是JSON数组、{"articles": [...]}，或Content-Type为application/x-ndjson的JSONL。
+    每条文章支持title、content、excerpt、tags、read_time、is_published、created_at、
+    program_id/program_name字段。按块提交，返回成功数、逐条错误和吞吐量。
+    """
+    try:
+        chunk_size = min(max(request.args.get('chunk_size', 200, type=int), 1), 1000)
+
+        if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+            items = iter_jsonl(request.stream)
+        else:
+            data = request.get_json()
+            items = data.get('articles', []) if isinstance(data, dict) else data
+            if not isinstance(items, list):
+                return jsonify({'error': '请求体必须是文章数组'}), 400
+            items = [item if isinstance(item, dict) else {'_error': '每条文章必须是JSON对象'}
+                     for item in items]
+
+        report = import_articles(items, chunk_size=chunk_size)
+        return jsonify(report), 201 if report['imported'] else 400
+
+    except RequestEntityTooLarge:
+        db.session.rollback()
+        return request_too_large_response()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @article_blueprint.route('/update/<int:article_id>', methods=['PUT'])
+@response_cache.invalidates(ARTICLES, TAGS, PROJECTS)
 def update_article(article_id):
     """更新文章"""
     try:
@@ -211,31 +358,32 @@ def update_article(article_id):
             article.title = data['title']
         if 'content' in data:
             article.content = data['content']
+            rendered = render_markdown(data['content'])
+            apply_rendered(article, rendered)
+            if 'read_time' not in data:
+                article.read_time = rendered['read_time']
         if 'excerpt' in data:
             article.excerpt = data['excerpt']
         if 'read_time' in data:
             article.read_time = data['read_time']
-        if 'is_published' in data:
+        if 'is_published' in data and bool(data['is_published']) != bool(article.is_published):
             article.is_published = data['is_published']
+            # 发布状态切换时同步月度归档和标签的已发布文章数
+            archive_service.adjust(article.created_at, 1 if article.is_published else -1)
+            adjust_published(article_id, 1 if article.is_published else -1)
 
-        # 处理标签更新
+        # 处理标签更新：对比新旧标签集合，只增删有变化的关联
+        tag_names = None
         if 'tags' in data:
-            # 删除现有的标签关联
-            ArticleTag.query.filter_by(article_id=article_id).delete()
-            
-            # 添加新的标签
-            for tag_name in data['tags']:
-                tag = Tag.query.filter_by(name=tag_name).first()
-                if not tag:
-                    tag = Tag(name=tag_name)
-                    db.session.add(tag)
-                    db.session.flush()
-
-                article_tag = ArticleTag(article_id=article_id, tag_id=tag.id)
-                db.session.add(article_tag)
+            tag_names, changed = set_article_tags(article_id, data['tags'], published=article.is_published)
+            if changed:
+                # 只修改标签时文章行本身不变，手动刷新updated_at以更新ETag
+                article.updated_at = datetime.utcnow()
 
         db.session.commit()
 
+        _sync_search_index(article, tag_names)
+
         return jsonify({
             'message': '文章更新成功',
             'article_id': article.id
@@ -247,13 +395,21 @@ def update_article(article_id):
 
 
 @article_blueprint.route('/delete/<int:article_id>', methods=['DELETE'])
+@response_cache.invalidates(ARTICLES, TAGS, PROJECTS)
 def delete_article(article_id):
     """删除文章"""
     try:
         article = Article.query.get_or_404(article_id)
 
-        # 先删除关联关系
-        ArticleTag.query.filter_by(article_id=article_id).delete()
+        # 同步月度归档
+        if article.is_published:
+            archive_service.adjust(article.created_at, -1)
+
+        # 先删除关联关系；所属项目的文章列表变化，更新项目的修改时间
+        project_ids = db.session.query(ProjectArticle.project_id).filter(ProjectArticle.article_id == article_id)
+        Project.query.filter(Project.id.in_(project_ids)) \
+            .update({Project.updated_at: datetime.utcnow()}, synchronize_session=False)
+        remove_article_tags(article_id, article.is_published)
         ProjectArticle.query.filter_by(article_id=article_id).delete()
         Comment.query.filter_by(article_id=article_id).delete()
         
@@ -261,6 +417,9 @@ def delete_article(article_id):
         db.session.delete(article)
         db.session.commit()
 
+        search_index.remove_article(article_id)
+        trending.remove(article_id)
+
         return jsonify({
             'message': '文章删除成功'
         })
@@ -271,21 +430,38 @@ def delete_article(article_id):
 
 
 @article_blueprint.route('/hot-articles', methods=['GET'])
+@conditional
+@response_cache.cached(ARTICLES)
 def get_hot_articles():
-    """获取热门文章（按浏览量排序的前4篇文章）"""
-    try:
-        articles = Article.query.filter_by(is_published=True) \
-            .order_by(Article.view_count.desc()) \
-            .limit(4) \
-            .all()
+    """获取热门文章
 
-        hot_articles = []
-        for article in articles:
-            hot_articles.append({
-                'id': article.id,
-                'title': article.title,
-                'view_count': article.view_count
-            })
+    mode=all_time（默认）按累计浏览量排序；mode=trending按时间衰减的互动热度排序。
+    limit为返回数量，默认4篇。
+    """
+    try:
+        mode = request.args.get('mode', 'all_time')
+        limit = min(max(request.args.get('limit', 4, type=int), 1), trending.top_k)
+
+        article_ids = trending.top(limit) if mode == 'trending' else None
+        if article_ids is not None:
+            # 从内存Top-K取ID，再按主键读取需要的列
+            rows = {}
+            if article_ids:
+                rows = {row.id: row for row in db.session.query(Article.id, Article.title, Article.view_count)
+                        .filter(Article.id.in_(article_ids), Article.is_published.is_(True))
+                        .all()}
+            articles = [rows[article_id] for article_id in article_ids if article_id in rows]
+        elif mode in ('all_time', 'trending'):
+            # 启动后热度排行首次计算完成前，trending暂时按累计浏览量排序
+            articles = db.session.query(Article.id, Article.title, Article.view_count) \
+                .filter(Article.is_published.is_(True)) \
+                .order_by(Article.view_count.desc()) \
+                .limit(limit) \
+                .all()
+        else:
+            return jsonify({'error': f'不支持的排序方式: {mode}'}), 400
+
+        hot_articles = [serialize_hot_article(article) for article in articles]
 
         return jsonify({'hot_articles': hot_articles})
 
@@ -294,32 +470,13 @@ def get_hot_articles():
 
 
 @article_blueprint.route('/archives', methods=['GET'])
+@conditional
+@response_cache.cached(ARTICLES)
 def get_archives():
     """获取文章归档数据（按月分组）"""
     try:
-        # 获取所有已发布文章
-        articles = Article.query.filter_by(is_published=True).all()
-
-        # 手动按月份分组统计
-        archive_dict = {}
-        for article in articles:
-            # 格式化月份：YYYY年MM月
-            month = article.created_at.strftime('%Y年%m月')
-            if month in archive_dict:
-                archive_dict[month] += 1
-            else:
-                archive_dict[month] = 1
-
-        # 转换为列表并按月份排序（降序）
-        archive_list = []
-        for month, count in archive_dict.items():
-            archive_list.append({
-                'date': month,
-                'count': count
-            })
-
-        # 按日期降序排序
-        archive_list.sort(key=lambda x: x['date'], reverse=True)
+        # 直接读取月度归档汇总表，按月份降序
+        archive_list = [serialize_archive(year, month, count) for year, month, count in archive_service.get_archives()]
 
         return jsonify({'archives': archive_list})
 
@@ -329,11 +486,16 @@ def get_archives():
 
 @article_blueprint.route('/search', methods=['GET'])
 def search_articles():
-    """搜索文章（按标题或标签）"""
+    """搜索文章（标题、摘要、标签和正文的全文检索），fields为逗号分隔的返回字段"""
     try:
+        try:
+            fields = parse_fields(request.args.get('fields'), ARTICLE_LIST_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
         query = request.args.get('query', '').strip()
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        per_page = min(max(request.args.get('per_page', 10, type=int), 1), 100)
 
         if not query:
             return jsonify({
@@ -343,58 +505,26 @@ def search_articles():
                 'current_page': page
             })
 
-        # 构建搜索查询
-        search_query = Article.query.filter_by(is_published=True)
-
-        # 按标题搜索（模糊匹配）
-        title_query = Article.title.ilike(f'%{query}%')
-
-        # 按标签搜索
-        tag_query = Article.query.join(ArticleTag).join(Tag).filter(Tag.name.ilike(f'%{query}%'))
-
-        # 合并两个查询结果（去重）
-        articles_from_title = search_query.filter(title_query).all()
-        articles_from_tags = tag_query.all()
-
-        # 合并结果并去重
-        all_articles = list(set(articles_from_title + articles_from_tags))
-
-        # 手动分页
-        total = len(all_articles)
+        # 通过倒排索引检索，按相关度排序并在索引端分页
+        article_ids, total = search_index.search(
+            query, offset=max(page - 1, 0) * per_page, limit=per_page
+        )
         pages = (total + per_page - 1) // per_page  # 向上取整
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        paginated_articles = all_articles[start_index:end_index]
 
-        # 批量获取标签，避免N+1查询问题
-        article_ids = [article.id for article in paginated_articles]
-        article_tags = {}
+        # 只加载当前页的文章，并保持相关度顺序
+        articles_by_id = {}
         if article_ids:
-            # 一次性获取所有文章的标签
-            tag_results = db.session.query(
-                ArticleTag.article_id,
-                Tag.name
-            ).join(Tag).filter(ArticleTag.article_id.in_(article_ids)).all()
-
-            for article_id, tag_name in tag_results:
-                if article_id not in article_tags:
-                    article_tags[article_id] = []
-                article_tags[article_id].append(tag_name)
-
-        articles = []
-        for article in paginated_articles:
-            articles.append({
-                'id': article.id,
-                'title': article.title,
-                'excerpt': article.excerpt,
-                'read_time': article.read_time,
-                'view_count': article.view_count,
-                'like_count': article.like_count,
-                'comment_count': article.comment_count,
-                'created_at': article.created_at.strftime('%Y-%m-%d'),
-                'tags': article_tags.get(article.id, []),
-                'program_name': article.program_name
-            })
+            page_articles = db.session.query(*columns_for(Article, fields, Article.id)) \
+                .filter(Article.id.in_(article_ids), Article.is_published.is_(True)) \
+                .all()
+            for article in page_articles:
+                articles_by_id[article.id] = article
+        paginated_articles = [articles_by_id[article_id] for article_id in article_ids
+                              if article_id in articles_by_id]
+
+        # 需要标签时批量获取，避免N+1查询问题
+        article_tags = article_tags_for([article.id for article in paginated_articles]) if 'tags' in fields else {}
+        articles = serialize_articles(paginated_articles, fields, article_tags)
 
         return jsonify({
             'articles': articles,
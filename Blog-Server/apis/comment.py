@@ -1,5 +1,9 @@
 from flask import Blueprint, request, jsonify
-from models import db, Article, Comment
+from models import db, Comment
+from serializers import serialize_comment
+from services import counters
+from services.response_cache import response_cache, COMMENTS
+from services.trending import trending
 
 comment_blueprint = Blueprint('comment', __name__)
 
@@ -9,20 +13,19 @@ comment_blueprint = Blueprint('comment', __name__)
 def get_comments(article_id):
     """获取文章的所有评论"""
     try:
-        comments = Comment.query.filter_by(
-            article_id=article_id,
-            is_approved=True
+        # 只查询返回的列，结果为行而不是ORM对象
+        comments = db.session.query(
+            Comment.id,
+            Comment.author_name,
+            Comment.author_email,
+            Comment.content,
+            Comment.created_at
+        ).filter(
+            Comment.article_id == article_id,
+            Comment.is_approved.is_(True)
         ).order_by(Comment.created_at.desc()).all()
 
-        comment_list = []
-        for comment in comments:
-            comment_list.append({
-                'id': comment.id,
-                'author_name': comment.author_name,
-                'author_email': comment.author_email,
-                'content': comment.content,
-                'created_at': comment.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            })
+        comment_list = [serialize_comment(comment) for comment in comments]
 
         return jsonify({'comments': comment_list})
 
@@ -31,13 +34,16 @@ def get_comments(article_id):
 
 
 @comment_blueprint.route('/create/<int:article_id>', methods=['POST'])
+@response_cache.invalidates(COMMENTS)
 def create_comment(article_id):
     """创建新评论"""
     try:
         data = request.get_json()
 
-        # 验证文章是否存在
-        article = Article.query.get_or_404(article_id)
+        # 原子地更新文章的评论计数，同时验证文章是否存在
+        if counters.increment(article_id, 'comment_count', 1) is None:
+            db.session.rollback()
+            return jsonify({'error': '文章不存在'}), 404
 
         # 创建评论
         comment = Comment(
@@ -48,11 +54,10 @@ def create_comment(article_id):
         )
 
         db.session.add(comment)
-
-        # 更新文章的评论计数
-        article.comment_count += 1
         db.session.commit()
 
+        trending.record(article_id, 'comment')
+
         return jsonify({
             'message': '评论提交成功',
             'comment_id': comment.id
@@ -64,11 +69,15 @@ def create_comment(article_id):
 
 
 @comment_blueprint.route('/delete/<int:comment_id>', methods=['DELETE'])
+@response_cache.invalidates(COMMENTS)
 def delete_comment(comment_id):
     """删除评论（管理员功能）"""
     try:
         comment = Comment.query.get_or_404(comment_id)
         db.session.delete(comment)
+
+        # 同步减少文章的评论计数
+        counters.increment(comment.article_id, 'comment_count', -1)
         db.session.commit()
 
         return jsonify({'message': '评论删除成功'})
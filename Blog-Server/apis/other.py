@@ -1,33 +1,41 @@
-from flask import Blueprint, jsonify
-from models import Tag, ArticleTag
-from sqlalchemy import func, desc
+from flask import Blueprint, request, jsonify
+from models import db, Tag
+from serializers import serialize_tag
+from services.response_cache import response_cache, ARTICLES, TAGS
+from utils.http_cache import conditional
 
 other_blueprint = Blueprint('other', __name__)
 
 
 @other_blueprint.route('/tag', methods=['GET'])
+@conditional
+@response_cache.cached(ARTICLES, TAGS)
 def get_tags():
-    """获取所有标签（按文章数量排序，返回前8个）"""
+    """获取标签及其文章数量（按文章数量降序）
+
+    limit：返回的标签个数，默认8；published_only：是否只统计已发布文章，默认true
+    """
     try:
-        # 查询标签及其关联的文章数量，按文章数量降序排序
-        tags_with_count = Tag.query \
-            .outerjoin(ArticleTag, Tag.id == ArticleTag.tag_id) \
-            .group_by(Tag.id) \
-            .order_by(desc(func.count(ArticleTag.id))) \
-            .limit(8) \
+        limit = min(max(request.args.get('limit', 8, type=int), 1), 100)
+        published_only = request.args.get('published_only', 'true').lower() != 'false'
+
+        # 文章数由写入时维护的计数列提供，按索引取前limit个，不再聚合关联表
+        article_count = Tag.published_count if published_only else Tag.article_count
+        tags_with_count = db.session.query(Tag.name, article_count) \
+            .order_by(article_count.desc(), Tag.name) \
+            .limit(limit) \
             .all()
 
         # 构建返回数据，包含标签名称和文章数量
-        tag_list = []
-        for tag in tags_with_count:
-            # 计算该标签的文章数量
-            article_count = len(tag.articles)
-            tag_list.append({
-                'name': tag.name,
-                'count': article_count
-            })
+        tag_list = [serialize_tag(name, count) for name, count in tags_with_count]
 
         return jsonify({'tags': tag_list})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+
+@other_blueprint.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """获取响应缓存的命中统计"""
+    return jsonify(response_cache.stats())
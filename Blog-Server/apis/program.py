@@ -1,53 +1,82 @@
 from flask import Blueprint, request, jsonify
-import os
 from datetime import datetime
-from werkzeug.utils import secure_filename
 from models import db, Project, Article, ProjectArticle
+from serializers import article_tags_for, serialize_article, serialize_articles, serialize_project
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
+from werkzeug.exceptions import RequestEntityTooLarge
+from services.images import ImageUploadError, image_pipeline
+from services.response_cache import response_cache, ARTICLES, PROJECTS
+from utils.fields import PROJECT_ARTICLE_FIELDS, PROJECT_FIELDS, PROJECT_LIST_ARTICLE_FIELDS, columns_for, parse_fields
+from utils.http_cache import conditional, make_etag, is_not_modified, not_modified_response, set_validators
+from utils.request_limits import request_too_large_response
 
 program_blueprint = Blueprint('program', __name__)
 
 
+def _existing_article_ids(article_ids):
+    """返回article_ids中实际存在的文章ID集合"""
+    if not article_ids:
+        return set()
+    return {article_id for (article_id,) in db.session.query(Article.id).filter(Article.id.in_(article_ids)).all()}
+
+
+def _save_project_image():
+    """保存请求中上传的项目图片，返回原图URL；未上传图片时返回None"""
+    file = request.files.get('image')
+    if file is None or file.filename == '':
+        return None
+    return image_pipeline.save_upload(file)
+
+
 @program_blueprint.route('/get-all', methods=['GET'])
+@conditional
+@response_cache.cached(PROJECTS, ARTICLES)
 def get_all_projects():
-    """获取所有项目（不分页）"""
+    """获取所有项目（不分页，按响应体计算ETag，支持条件请求）
+
+    fields为逗号分隔的项目字段，article_fields为每个项目附带的文章字段；
+    不请求articles时不查询关联文章，只请求article_count时只做分组计数。
+    """
     try:
-        # 获取所有项目
-        projects = Project.query.order_by(Project.created_at.desc()).all()
+        try:
+            fields = parse_fields(request.args.get('fields'), PROJECT_FIELDS)
+            article_fields = parse_fields(request.args.get('article_fields'), PROJECT_LIST_ARTICLE_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # 获取所有项目（只加载请求的列）
+        projects = Project.query.options(load_only(*columns_for(Project, fields, Project.id, Project.created_at))) \
+            .order_by(Project.created_at.desc()) \
+            .all()
 
         # 批量获取每个项目关联的文章，避免N+1查询问题
         project_ids = [project.id for project in projects]
         project_articles = {}
-        
-        if project_ids:
+        article_counts = {}
+
+        if project_ids and 'articles' in fields:
             # 一次性获取所有项目关联的文章
             article_results = db.session.query(
                 ProjectArticle.project_id,
-                Article.id,
-                Article.title,
-                Article.created_at
+                *columns_for(Article, article_fields)
             ).join(Article).filter(ProjectArticle.project_id.in_(project_ids)).all()
 
-            for project_id, article_id, article_title, article_created_at in article_results:
-                if project_id not in project_articles:
-                    project_articles[project_id] = []
-                project_articles[project_id].append({
-                    'id': article_id,
-                    'title': article_title,
-                    'created_at': article_created_at.strftime('%Y-%m-%d') if article_created_at else ''
-                })
+            for row in article_results:
+                project_articles.setdefault(row.project_id, []).append(serialize_article(row, article_fields, {}))
+            article_counts = {project_id: len(articles) for project_id, articles in project_articles.items()}
+        elif project_ids and 'article_count' in fields:
+            article_counts = dict(db.session.query(ProjectArticle.project_id, func.count(ProjectArticle.id))
+                                  .filter(ProjectArticle.project_id.in_(project_ids))
+                                  .group_by(ProjectArticle.project_id)
+                                  .all())
 
         projects_list = []
         for project in projects:
-            projects_list.append({
-                'id': project.id,
-                'name': project.name,
-                'description': project.description,
-                'image_url': project.image_url,  # 添加图片URL字段
-                'created_at': project.created_at.strftime('%Y-%m-%d'),
-                'updated_at': project.updated_at.strftime('%Y-%m-%d') if project.updated_at else '',
-                'article_count': len(project_articles.get(project.id, [])),
+            projects_list.append(serialize_project(project, fields, {
+                'article_count': article_counts.get(project.id, 0),
                 'articles': project_articles.get(project.id, [])
-            })
+            }))
 
         return jsonify({
             'projects': projects_list,
@@ -59,10 +88,13 @@ def get_all_projects():
 
 
 @program_blueprint.route('/create', methods=['POST'])
+@response_cache.invalidates(PROJECTS, ARTICLES)
 def create_project():
     """创建新项目（支持图片上传）"""
+    image_url = None
     try:
         # 获取表单数据
+        image_pipeline.check_content_length(request.content_length)
         name = request.form.get('name')
         description = request.form.get('description', '')
         article_ids_str = request.form.get('article_ids', '')
@@ -71,47 +103,29 @@ def create_project():
         if not name:
             return jsonify({'error': '项目名称不能为空'}), 400
 
-        # 创建项目
+        # 保存上传的图片（校验格式和大小，按内容哈希去重）
+        image_url = _save_project_image()
+
+        # 创建项目（相同图片已生成过缩放版本时直接复用）
         project = Project(
             name=name,
-            description=description
+            description=description,
+            image_url=image_url,
+            image_variants=image_pipeline.existing_variants(image_url) if image_url else None
         )
 
         db.session.add(project)
         db.session.flush()  # 获取project.id
-        
-        # 处理图片上传
-        if 'image' in request.files:
-            file = request.files['image']
-            if file.filename != '':
-                # 验证文件类型
-                allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-                if '.' in file.filename and file.filename.rsplit('.', 1)[1].lower() in allowed_extensions:
-                    # 获取文件扩展名
-                    file_ext = file.filename.rsplit('.', 1)[1].lower()
-                    
-                    # 生成文件名：program{id}.{ext}
-                    filename = f"program{project.id}.{file_ext}"
-                    
-                    # 创建上传目录
-                    upload_dir = os.path.join('static', 'uploads', 'projects')
-                    os.makedirs(upload_dir, exist_ok=True)
-                    
-                    # 保存文件
-                    file_path = os.path.join(upload_dir, filename)
-                    file.save(file_path)
-                    
-                    # 更新项目的image_url字段
-                    project.image_url = f"/static/uploads/projects/{filename}"
 
         # 处理关联的文章（可选）
         if article_ids_str:
             try:
                 article_ids = [int(id_str.strip()) for id_str in article_ids_str.split(',') if id_str.strip()]
+                article_ids = list(dict.fromkeys(article_ids))  # 去重，避免重复的项目-文章关联
+                # 一次查询验证文章是否存在
+                existing_ids = _existing_article_ids(article_ids)
                 for article_id in article_ids:
-                    # 验证文章是否存在
-                    article = Article.query.get(article_id)
-                    if article:
+                    if article_id in existing_ids:
                         project_article = ProjectArticle(
                             project_id=project.id,
                             article_id=article_id
@@ -122,65 +136,113 @@ def create_project():
 
         db.session.commit()
 
+        # 在后台生成缩放和WebP版本
+        if image_url and project.image_variants is None:
+            image_pipeline.generate_variants(project.id, image_url)
+
         return jsonify({
             'message': '项目创建成功',
             'project_id': project.id,
             'image_url': project.image_url
         }), 201
 
+    except ImageUploadError as e:
+        return jsonify({'error': str(e)}), e.status
+    except RequestEntityTooLarge:
+        return request_too_large_response()
     except Exception as e:
         db.session.rollback()
+        image_pipeline.release(image_url)
         return jsonify({'error': str(e)}), 500
 
 
 @program_blueprint.route('/single/<int:project_id>', methods=['GET'])
 def get_project(project_id):
-    """获取单个项目详情"""
-    try:
-        project = Project.query.get_or_404(project_id)
+    """获取单个项目详情（支持ETag / Last-Modified条件请求）
 
-        # 获取项目关联的文章（包含所有字段）
-        articles = Article.query.join(ProjectArticle).filter(
-            ProjectArticle.project_id == project_id
-        ).order_by(Article.created_at.desc()).all()
+    关联文章分页返回（page、per_page，默认每页20篇），按发布时间降序；
+    默认不返回文章正文，include_content=true时才加载content。
+    fields为逗号分隔的项目字段，article_fields为每篇文章的字段；不请求articles时不查询文章。
+    """
+    try:
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+        include_content = request.args.get('include_content', 'false').lower() == 'true'
+        default_article_fields = PROJECT_ARTICLE_FIELDS if include_content else PROJECT_ARTICLE_FIELDS[:-1]
+        try:
+            fields = parse_fields(request.args.get('fields'), PROJECT_FIELDS)
+            article_fields = parse_fields(request.args.get('article_fields'), PROJECT_ARTICLE_FIELDS,
+                                          default_article_fields)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # 先只读取项目和关联文章的版本字段，客户端缓存仍然有效时不加载文章
+        project_updated_at = db.session.query(Project.updated_at).filter(Project.id == project_id).first()
+        if project_updated_at is None:
+            return jsonify({'error': '项目不存在'}), 404
+        project_updated_at = project_updated_at[0]
+
+        article_version = db.session.query(
+            func.count(Article.id),
+            func.max(Article.updated_at),
+            func.sum(Article.view_count + Article.like_count + Article.comment_count)
+        ).join(ProjectArticle, ProjectArticle.article_id == Article.id) \
+            .filter(ProjectArticle.project_id == project_id) \
+            .one()
+        article_count = article_version[0]
+
+        last_modified = max(filter(None, [project_updated_at, article_version[1]]), default=None)
+        etag = make_etag('project', project_id, project_updated_at, *article_version,
+                         page, per_page, ','.join(fields), ','.join(article_fields))
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        project = db.session.get(Project, project_id, options=[load_only(*columns_for(Project, fields, Project.id))])
 
         articles_list = []
-        for article in articles:
-            articles_list.append({
-                'id': article.id,
-                'title': article.title,
-                'content': article.content,
-                'excerpt': article.excerpt,
-                'read_time': article.read_time,
-                'view_count': article.view_count,
-                'like_count': article.like_count,
-                'comment_count': article.comment_count,
-                'created_at': article.created_at.strftime('%Y-%m-%d'),
-                'tags': [tag.name for tag in article.tags]
+        if 'articles' in fields:
+            # 只加载当前页文章请求的列
+            articles = Article.query.options(load_only(*columns_for(Article, article_fields, Article.id))) \
+                .join(ProjectArticle) \
+                .filter(ProjectArticle.project_id == project_id) \
+                .order_by(Article.created_at.desc(), Article.id.desc()) \
+                .offset((page - 1) * per_page) \
+                .limit(per_page) \
+                .all()
+
+            # 需要标签时一次查询获取当前页所有文章的标签
+            article_tags = article_tags_for([article.id for article in articles]) if 'tags' in article_fields else {}
+            articles_list = serialize_articles(articles, article_fields, article_tags)
+
+        result = serialize_project(project, fields, {
+            'article_count': article_count,
+            'articles': articles_list
+        })
+        if 'articles' in fields:
+            result.update({
+                'page': page,
+                'per_page': per_page,
+                'pages': (article_count + per_page - 1) // per_page
             })
 
-        return jsonify({
-            'id': project.id,
-            'name': project.name,
-            'description': project.description,
-            'image_url': project.image_url,  # 添加图片URL字段
-            'created_at': project.created_at.strftime('%Y-%m-%d'),
-            'updated_at': project.updated_at.strftime('%Y-%m-%d') if project.updated_at else '',
-            'articles': articles_list,
-            'article_count': len(articles_list)
-        })
+        response = jsonify(result)
+        return set_validators(response, etag, last_modified)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @program_blueprint.route('/update/<int:project_id>', methods=['POST'])
+@response_cache.invalidates(PROJECTS, ARTICLES)
 def update_project(project_id):
     """更新项目信息（支持图片上传）"""
+    image_url = None
     try:
         project = Project.query.get_or_404(project_id)
-        
+        old_image = (project.image_url, project.image_variants)
+
         # 获取表单数据
+        image_pipeline.check_content_length(request.content_length)
         name = request.form.get('name')
         description = request.form.get('description')
         article_ids_str = request.form.get('article_ids', '')
@@ -192,57 +254,36 @@ def update_project(project_id):
         if description is not None:
             project.description = description
         
-        # 处理图片删除
-        if remove_image and project.image_url:
-            # 删除物理文件
-            file_path = os.path.join(project.image_url.lstrip('/'))
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            # 清空数据库字段
+        # 处理图片删除（文件在提交后没有其他项目使用时删除）
+        if remove_image:
             project.image_url = None
-        
-        # 处理图片上传（新图片会覆盖旧图片）
-        if 'image' in request.files:
-            file = request.files['image']
-            if file.filename != '':
-                # 验证文件类型
-                allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-                if '.' in file.filename and file.filename.rsplit('.', 1)[1].lower() in allowed_extensions:
-                    # 获取文件扩展名
-                    file_ext = file.filename.rsplit('.', 1)[1].lower()
-                    
-                    # 生成文件名：program{id}.{ext}
-                    filename = f"program{project_id}.{file_ext}"
-                    
-                    # 创建上传目录
-                    upload_dir = os.path.join('static', 'uploads', 'projects')
-                    os.makedirs(upload_dir, exist_ok=True)
-                    
-                    # 如果已有旧图片，先删除
-                    if project.image_url:
-                        old_file_path = os.path.join(project.image_url.lstrip('/'))
-                        if os.path.exists(old_file_path):
-                            os.remove(old_file_path)
-                    
-                    # 保存新文件
-                    file_path = os.path.join(upload_dir, filename)
-                    file.save(file_path)
-                    
-                    # 更新项目的image_url字段
-                    project.image_url = f"/static/uploads/projects/{filename}"
+            project.image_variants = None
+
+        # 处理图片上传（新图片替换旧图片）
+        image_url = _save_project_image()
+        if image_url and image_url != old_image[0]:
+            # 先查询再赋值，避免自动flush后匹配到本项目的旧版本
+            variants = image_pipeline.existing_variants(image_url)
+            project.image_url = image_url
+            project.image_variants = variants
+        elif image_url:
+            # 重新上传了相同的图片
+            project.image_url, project.image_variants = old_image
         
         # 更新关联的文章（可选）
         # 只有当article_ids_str不为None且不为空字符串时才更新关联
         if article_ids_str is not None and article_ids_str != '':
             # 先删除现有的关联
             ProjectArticle.query.filter_by(project_id=project_id).delete()
+            project.updated_at = datetime.utcnow()
             
             # 添加新的关联
             try:
                 article_ids = [int(id_str.strip()) for id_str in article_ids_str.split(',') if id_str.strip()]
+                article_ids = list(dict.fromkeys(article_ids))  # 去重，避免重复的项目-文章关联
+                existing_ids = _existing_article_ids(article_ids)
                 for article_id in article_ids:
-                    article = Article.query.get(article_id)
-                    if article:
+                    if article_id in existing_ids:
                         project_article = ProjectArticle(
                             project_id=project_id,
                             article_id=article_id
@@ -253,22 +294,39 @@ def update_project(project_id):
 
         db.session.commit()
 
+        if project.image_url != old_image[0]:
+            image_pipeline.release(*old_image)
+            if project.image_url and project.image_variants is None:
+                image_pipeline.generate_variants(project.id, project.image_url)
+
         return jsonify({
             'message': '项目更新成功',
             'project_id': project.id,
             'image_url': project.image_url
         })
 
+    except ImageUploadError as e:
+        db.session.rollback()
+        image_pipeline.release(image_url)
+        return jsonify({'error': str(e)}), e.status
+    except RequestEntityTooLarge:
+        db.session.rollback()
+        image_pipeline.release(image_url)
+        return request_too_large_response()
     except Exception as e:
+        # 回滚后新上传的图片没有项目使用时删除；重新上传的旧图片仍被本项目引用，会保留
         db.session.rollback()
+        image_pipeline.release(image_url)
         return jsonify({'error': str(e)}), 500
 
 
 @program_blueprint.route('/delete/<int:project_id>', methods=['DELETE'])
+@response_cache.invalidates(PROJECTS, ARTICLES)
 def delete_project(project_id):
     """删除项目"""
     try:
         project = Project.query.get_or_404(project_id)
+        image = (project.image_url, project.image_variants)
 
         # 先删除关联关系
         ProjectArticle.query.filter_by(project_id=project_id).delete()
@@ -277,6 +335,9 @@ def delete_project(project_id):
         db.session.delete(project)
         db.session.commit()
 
+        # 没有其他项目使用时删除图片文件
+        image_pipeline.release(*image)
+
         return jsonify({
             'message': '项目删除成功'
         })
@@ -287,6 +348,7 @@ def delete_project(project_id):
 
 
 @program_blueprint.route('/<int:project_id>/add-article', methods=['POST'])
+@response_cache.invalidates(PROJECTS, ARTICLES)
 def add_article_to_project(project_id):
     """向项目添加文章"""
     try:
@@ -324,6 +386,8 @@ def add_article_to_project(project_id):
         
         # 更新文章的program_name字段
         article.program_name = project.name
+        # 关联变化不修改projects表的列，需要手动更新时间，项目详情的Last-Modified才会变化
+        project.updated_at = datetime.utcnow()
         
         db.session.add(project_article)
         db.session.commit()
@@ -340,6 +404,7 @@ def add_article_to_project(project_id):
 
 
 @program_blueprint.route('/<int:project_id>/remove-article/<int:article_id>', methods=['DELETE'])
+@response_cache.invalidates(PROJECTS, ARTICLES)
 def remove_article_from_project(project_id, article_id):
     """从项目中移除文章"""
     try:
@@ -361,6 +426,7 @@ def remove_article_from_project(project_id, article_id):
 
         # 删除关联
         db.session.delete(project_article)
+        project.updated_at = datetime.utcnow()
         db.session.commit()
 
         return jsonify({
@@ -1,24 +1,28 @@
 from flask import Blueprint, request, jsonify
-from models import db, Article
+from models import db
+from services import counters
+from services.trending import trending
+from services.view_buffer import view_buffer
 
 statistic_blueprint = Blueprint('statistic', __name__)
 
 
 @statistic_blueprint.route('/<int:article_id>/view', methods=['POST'])
 def increment_view_count(article_id):
-    """增加文章浏览量"""
+    """增加文章浏览量（写入缓冲，批量落库）"""
     try:
-        article = Article.query.get_or_404(article_id)
-        article.view_count += 1
-        db.session.commit()
+        view_count = view_buffer.increment(article_id)
+        if view_count is None:
+            return jsonify({'error': '文章不存在'}), 404
+
+        trending.record(article_id, 'view')
 
         return jsonify({
             'message': '浏览量增加成功',
-            'view_count': article.view_count
+            'view_count': view_count
         })
 
     except Exception as e:
-        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
@@ -26,24 +30,29 @@ def increment_view_count(article_id):
 def toggle_like_count(article_id):
     """切换文章点赞状态"""
     try:
-        article = Article.query.get_or_404(article_id)
-
         # 获取请求数据，判断是点赞还是取消点赞
         data = request.get_json() or {}
         action = data.get('action', 'like')  # like 或 unlike
 
         if action == 'like':
-            article.like_count += 1
+            like_count = counters.increment(article_id, 'like_count', 1)
             message = '点赞成功'
         else:
-            article.like_count = max(0, article.like_count - 1)  # 确保不会变成负数
+            like_count = counters.increment(article_id, 'like_count', -1)  # 数据库端保证不会变成负数
             message = '取消点赞成功'
 
+        if like_count is None:
+            db.session.rollback()
+            return jsonify({'error': '文章不存在'}), 404
+
         db.session.commit()
 
+        if action == 'like':
+            trending.record(article_id, 'like')
+
         return jsonify({
             'message': message,
-            'like_count': article.like_count,
+            'like_count': like_count,
             'action': action
         })
 
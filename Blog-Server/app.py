@@ -2,6 +2,15 @@ from flask import Flask
 from flask_cors import CORS
 from config import Config
 from models import db
+from services.metrics import metrics
+from services.query_guard import query_guard
+from services.view_buffer import view_buffer
+from services.search import search_index
+from services.response_cache import response_cache
+from services.trending import trending
+from services.compression import compressor
+from services.images import image_pipeline
+from utils.json_provider import json_provider_for
 
 from apis.article import article_blueprint
 from apis.comment import comment_blueprint
@@ -12,9 +21,36 @@ from apis.program import program_blueprint
 app = Flask(__name__)
 app.config.from_object(Config)
 
+# JSON序列化（安装orjson时使用orjson）
+app.json = json_provider_for(app)
+
 # 初始化数据库
 db.init_app(app)
 
+# 请求延迟、SQL语句数和连接池指标（/metrics，最先初始化以便统计其他钩子的耗时）
+metrics.init_app(app)
+
+# N+1查询、延迟加载检查和慢查询日志（开发/测试环境）
+query_guard.init_app(app)
+
+# 浏览量写缓冲（定时批量落库，进程退出时落库）
+view_buffer.init_app(app)
+
+# 文章全文检索索引
+search_index.init_app(app)
+
+# 读接口响应缓存
+response_cache.init_app(app)
+
+# 热门文章时间衰减排行
+trending.init_app(app)
+
+# 响应压缩（gzip/brotli）
+compressor.init_app(app)
+
+# 项目图片上传（后台生成缩放和WebP版本）
+image_pipeline.init_app(app)
+
 # 配置CORS
 CORS(app, origins=Config.CORS_ORIGINS)
 
@@ -0,0 +1,170 @@
+"""
+基准测试用例：覆盖所有蓝图的每个接口
+
+每个用例由请求方法、URL和可选的准备函数组成。URL和请求参数可以引用fixtures
+中从数据库选出的文章、项目、标签等；准备函数在计时之外执行（例如先创建一篇文章再测删除），
+返回值合并到fixtures中供本次请求使用。
+"""
+
+from sqlalchemy import func
+
+from models import db, Article, ArticleTag, Project, ProjectArticle, Tag
+
+
+class Case:
+    def __init__(self, name, method, url, json=None, data=None, prepare=None, heavy=False):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.json = json
+        self.data = data
+        self.prepare = prepare
+        self.heavy = heavy  # 返回全部数据的接口，只测一次
+
+    def build(self, client, fixtures):
+        """执行准备步骤，返回本次请求的 (method, url, kwargs)"""
+        values = dict(fixtures)
+        if self.prepare:
+            values.update(self.prepare(client, values))
+        kwargs = {}
+        if self.json is not None:
+            kwargs['json'] = _fill(self.json, values)
+        if self.data is not None:
+            kwargs['data'] = _fill(self.data, values)
+        return self.method, self.url.format(**values), kwargs
+
+
+def _fill(value, values):
+    if isinstance(value, str):
+        # 整个值只是一个占位符时保留原类型（如整数ID）
+        if value.startswith('{') and value.endswith('}') and value[1:-1] in values:
+            return values[value[1:-1]]
+        return value.format(**values)
+    if isinstance(value, dict):
+        return {key: _fill(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, values) for item in value]
+    return value
+
+
+def load_fixtures():
+    """从已生成的数据中选出用例引用的对象，需要在应用上下文中调用"""
+    published = db.session.query(func.count(Article.id)).filter(Article.is_published.is_(True)).scalar()
+    hot_article = db.session.query(Article.id).filter(Article.is_published.is_(True)) \
+        .order_by(Article.view_count.desc()).limit(1).scalar()
+    middle_article = db.session.query(Article.id).filter(Article.is_published.is_(True)) \
+        .order_by(Article.id).offset(published // 2).limit(1).scalar()
+    top_tag = db.session.query(Tag.name).join(ArticleTag) \
+        .group_by(Tag.id, Tag.name).order_by(func.count(ArticleTag.id).desc()).limit(1).scalar()
+    top_project = db.session.query(ProjectArticle.project_id) \
+        .group_by(ProjectArticle.project_id).order_by(func.count(ProjectArticle.id).desc()).limit(1).scalar()
+    latest = db.session.query(func.max(Article.created_at)).filter(Article.is_published.is_(True)).scalar()
+
+    return {
+        'hot_article': hot_article,
+        'article': middle_article,
+        'tag': top_tag or '',
+        'project': top_project or db.session.query(func.min(Project.id)).scalar(),
+        'archive': latest.strftime('%Y-%m') if latest else '',
+        'deep_page': max(published // 10 // 2, 1),
+    }
+
+
+# ---------- 准备函数（不计时） ----------
+
+def _create_article(client, values):
+    response = client.post('/article/create', json={
+        'title': '基准测试文章',
+        'content': '## 基准测试\n\n用于基准测试的临时文章。',
+        'tags': ['基准测试'],
+    })
+    return {'new_article': response.get_json()['article_id']}
+
+
+def _create_comment(client, values):
+    response = client.post(f"/comment/create/{values['article']}", json={
+        'author_name': '基准测试',
+        'content': '用于基准测试的临时评论。',
+    })
+    return {'new_comment': response.get_json()['comment_id']}
+
+
+def _create_project(client, values):
+    response = client.post('/program/create', data={'name': '基准测试项目', 'description': '临时项目'})
+    return {'new_project': response.get_json()['project_id']}
+
+
+def _create_project_and_article(client, values):
+    result = _create_project(client, values)
+    result.update(_create_article(client, values))
+    return result
+
+
+def _add_article_to_project(client, values):
+    result = _create_project_and_article(client, values)
+    client.post(f"/program/{result['new_project']}/add-article", json={'article_id': result['new_article']})
+    return result
+
+
+BULK_ARTICLES = [
+    {'title': f'批量导入基准测试{i}', 'content': f'## 批量导入\n\n第{i}篇。', 'tags': ['基准测试', 'Python']}
+    for i in range(20)
+]
+
+CASES = [
+    # 文章
+    Case('article.get-page', 'GET', '/article/get-page?page=1&per_page=10'),
+    Case('article.get-page.deep', 'GET', '/article/get-page?page={deep_page}&per_page=10'),
+    Case('article.get-page.cursor', 'GET', '/article/get-page?cursor=&per_page=10'),
+    Case('article.get-page.tag', 'GET', '/article/get-page?tag={tag}&per_page=10'),
+    Case('article.get-page.archive', 'GET', '/article/get-page?archive={archive}&per_page=10'),
+    Case('article.all-articles', 'GET', '/article/all-articles', heavy=True),
+    Case('article.all-articles.stream', 'GET', '/article/all-articles?stream=true', heavy=True),
+    Case('article.single', 'GET', '/article/single/{article}'),
+    Case('article.single.html', 'GET', '/article/single/{article}?format=html'),
+    Case('article.create', 'POST', '/article/create', json={
+        'title': '基准测试文章',
+        'content': '## 基准测试\n\n用于基准测试的文章，包含`代码`和[链接](https://example.com)。',
+        'tags': ['基准测试', 'Python', 'Flask'],
+    }),
+    Case('article.bulk-create', 'POST', '/article/bulk-create', json=BULK_ARTICLES),
+    Case('article.update', 'PUT', '/article/update/{new_article}', json={
+        'content': '## 已更新\n\n更新后的正文。',
+        'tags': ['基准测试', 'Vue'],
+    }, prepare=_create_article),
+    Case('article.delete', 'DELETE', '/article/delete/{new_article}', prepare=_create_article),
+    Case('article.hot-articles', 'GET', '/article/hot-articles'),
+    Case('article.hot-articles.trending', 'GET', '/article/hot-articles?mode=trending&limit=10'),
+    Case('article.archives', 'GET', '/article/archives'),
+    Case('article.search', 'GET', '/article/search?query=Python'),
+    Case('article.search.cjk', 'GET', '/article/search?query=数据库优化'),
+
+    # 评论
+    Case('comment.get-all', 'GET', '/comment/get-all/{hot_article}'),
+    Case('comment.create', 'POST', '/comment/create/{article}', json={
+        'author_name': '基准测试',
+        'author_email': 'bench@example.com',
+        'content': '用于基准测试的评论。',
+    }),
+    Case('comment.delete', 'DELETE', '/comment/delete/{new_comment}', prepare=_create_comment),
+
+    # 项目
+    Case('program.get-all', 'GET', '/program/get-all'),
+    Case('program.single', 'GET', '/program/single/{project}'),
+    Case('program.create', 'POST', '/program/create', data={'name': '基准测试项目', 'description': '基准测试'}),
+    Case('program.update', 'POST', '/program/update/{new_project}', data={'description': '已更新'},
+         prepare=_create_project),
+    Case('program.delete', 'DELETE', '/program/delete/{new_project}', prepare=_create_project),
+    Case('program.add-article', 'POST', '/program/{new_project}/add-article', json={'article_id': '{new_article}'},
+         prepare=_create_project_and_article),
+    Case('program.remove-article', 'DELETE', '/program/{new_project}/remove-article/{new_article}',
+         prepare=_add_article_to_project),
+
+    # 统计
+    Case('statistic.view', 'POST', '/statistic/{article}/view'),
+    Case('statistic.like', 'POST', '/statistic/{article}/like', json={'action': 'like'}),
+
+    # 其他
+    Case('other.tag', 'GET', '/other/tag'),
+    Case('other.cache-stats', 'GET', '/other/cache-stats'),
+]
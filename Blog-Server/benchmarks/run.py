@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+数据规模基准测试
+按不同文章数生成SQLite数据库，用Flask测试客户端逐个调用所有接口，
+记录每次调用的延迟、SQL语句数和内存峰值，并与保存的基线比较
+
+使用方法（在Blog-Server目录下运行）：
+    python benchmarks/run.py                                  # 默认1000篇文章
+    python benchmarks/run.py --sizes 1000,100000,1000000      # 多个数据规模
+    python benchmarks/run.py --cases article.get-page,article.search
+    python benchmarks/run.py --update-baseline                # 把本次结果写入基线
+
+每个数据规模在独立的子进程中运行（应用在导入时绑定数据库）。生成的数据库缓存在
+benchmarks/data/，每次运行前复制一份，写接口的测试不会影响下一次运行。
+有接口超过基线阈值，或者某个数据规模没有基线时以状态码1退出，可以直接用于CI。
+默认1000篇文章的基线随代码提交在benchmarks/baselines.json。
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, 'data')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baselines.json')
+
+SEED = 42
+
+
+# ---------- 子进程：生成数据库 ----------
+
+def seed_database(size):
+    from app import app
+    from utils.init_data.generate_data import generate
+
+    with app.app_context():
+        result = generate(
+            articles=size,
+            tags=min(max(size // 100, 50), 5000),
+            comments=size * 2,
+            projects=min(max(size // 1000, 5), 1000),
+            seed=SEED,
+            chunk_size=5000,
+            log=lambda message: None,
+        )
+    print(f"  生成 {result['total_rows']} 行，{result['rows_per_second']:,.0f} 行/秒", file=sys.stderr)
+
+
+# ---------- 子进程：运行用例 ----------
+
+def run_cases(repeat, names):
+    from sqlalchemy import event
+
+    from app import app
+    from models import db
+    from services.response_cache import response_cache
+    from services.search import search_index
+    from services.trending import trending
+    from benchmarks.cases import CASES, load_fixtures
+
+    # 关闭响应缓存，测量的是每次请求实际访问数据库的开销
+    response_cache.enabled = False
+    # 热度排行在后台线程中首次计算，等它完成，避免其查询和内存分配计入第一个用例
+    trending.wait_until_built(timeout=60)
+    client = app.test_client()
+
+    with app.app_context():
+        # 全文索引平时在首次搜索时于后台构建，这里提前同步构建，测量的是索引就绪后的稳定状态
+        search_index.rebuild()
+        fixtures = load_fixtures()
+        statements = [0]
+
+        def count_statement(*args):
+            statements[0] += 1
+
+        event.listen(db.engine, 'before_cursor_execute', count_statement)
+
+    results = {}
+    for case in CASES:
+        if names and case.name not in names:
+            continue
+
+        # 预热（首次调用可能构建索引、排行等内存结构），单独记录
+        first_ms, status = _call(client, case, fixtures)
+
+        latencies = []
+        for _ in range(1 if case.heavy else repeat):
+            elapsed_ms, status = _call(client, case, fixtures)
+            latencies.append(elapsed_ms)
+
+        # 单独调用一次统计SQL语句数和内存峰值（tracemalloc会拖慢调用，不计入延迟）
+        statements[0] = 0
+        tracemalloc.start()
+        _, status = _call(client, case, fixtures, before=lambda: _reset_counters(statements))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        latencies.sort()
+        results[case.name] = {
+            'status': status,
+            'first_ms': round(first_ms, 3),
+            'p50_ms': round(_percentile(latencies, 50), 3),
+            'p95_ms': round(_percentile(latencies, 95), 3),
+            'queries': statements[0],
+            'peak_kb': round(peak / 1024, 1),
+        }
+        print(f"  {case.name:<32} {results[case.name]['p50_ms']:>10.2f} ms", file=sys.stderr)
+    return results
+
+
+def _call(client, case, fixtures, before=None):
+    method, url, kwargs = case.build(client, fixtures)
+    if before:
+        before()
+    started = time.perf_counter()
+    response = client.open(url, method=method, **kwargs)
+    response.get_data()  # 读完流式响应
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    response.close()
+    return elapsed_ms, response.status_code
+
+
+def _reset_counters(statements):
+    statements[0] = 0
+    tracemalloc.reset_peak()
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+# ---------- 主进程 ----------
+
+def run_size(size, args):
+    """在子进程中为一个数据规模生成（或复用）数据库并运行用例"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    template = os.path.join(DATA_DIR, f'blog_{size}_seed{SEED}.db')
+    working = os.path.join(DATA_DIR, f'blog_{size}_run.db')
+
+    if not os.path.exists(template) or args.reseed:
+        print(f"生成 {size} 篇文章的数据库...", file=sys.stderr)
+        partial = template + '.partial'
+        if os.path.exists(partial):
+            os.remove(partial)
+        _subprocess(partial, ['--seed-db', str(size)])
+        os.replace(partial, template)
+
+    shutil.copyfile(template, working)
+    print(f"运行 {size} 篇文章的基准测试...", file=sys.stderr)
+    command = ['--worker', '--repeat', str(args.repeat)]
+    if args.cases:
+        command += ['--cases', args.cases]
+    output = _subprocess(working, command)
+    os.remove(working)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _subprocess(database, arguments):
+    env = dict(os.environ, DATABASE_URL='sqlite:///' + database)
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__)] + arguments,
+        cwd=SERVER_DIR, env=env, stdout=subprocess.PIPE, check=True, text=True
+    )
+    return completed.stdout
+
+
+def compare(results, baselines, args):
+    """返回 (超过阈值的回归列表, 没有基线的用例列表)
+
+    整个数据规模都没有基线时视为回归：否则比较永远通过，CI无法发现问题
+    """
+    regressions = []
+    missing = []
+    for size, cases in results.items():
+        if size not in baselines:
+            regressions.append(f"[{size}] 没有基线，先用 --update-baseline 记录该数据规模的基线")
+        for name, current in cases.items():
+            baseline = baselines.get(size, {}).get(name)
+            if current['status'] >= 400:
+                regressions.append(f"[{size}] {name}: 状态码 {current['status']}")
+            if not baseline:
+                if size in baselines:
+                    missing.append(f"[{size}] {name}")
+                continue
+            if (current['p50_ms'] > baseline['p50_ms'] * (1 + args.latency_threshold)
+                    and current['p50_ms'] - baseline['p50_ms'] > args.latency_floor_ms):
+                regressions.append(
+                    f"[{size}] {name}: 延迟 {baseline['p50_ms']:.2f} -> {current['p50_ms']:.2f} ms")
+            if current['queries'] > baseline['queries'] + args.query_slack:
+                regressions.append(
+                    f"[{size}] {name}: SQL语句数 {baseline['queries']} -> {current['queries']}")
+            if (current['peak_kb'] > baseline['peak_kb'] * (1 + args.memory_threshold)
+                    and current['peak_kb'] - baseline['peak_kb'] > args.memory_floor_kb):
+                regressions.append(
+                    f"[{size}] {name}: 内存峰值 {baseline['peak_kb']:.0f} -> {current['peak_kb']:.0f} KB")
+    return regressions, missing
+
+
+def print_table(results, baselines):
+    for size, cases in results.items():
+        print(f"\n文章数 {size}")
+        print(f"{'接口':<32}{'状态':>6}{'首次ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'SQL数':>8}{'峰值KB':>10}{'基线p50':>10}")
+        for name, item in cases.items():
+            baseline = baselines.get(size, {}).get(name)
+            print(f"{name:<32}{item['status']:>6}{item['first_ms']:>10.2f}{item['p50_ms']:>10.2f}"
+                  f"{item['p95_ms']:>10.2f}{item['queries']:>8}{item['peak_kb']:>10.0f}"
+                  f"{baseline['p50_ms'] if baseline else '-':>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='数据规模基准测试')
+    parser.add_argument('--sizes', default='1000', help='以逗号分隔的文章数，如 1000,100000,1000000')
+    parser.add_argument('--repeat', type=int, default=5, help='每个接口计时的调用次数（默认5）')
+    parser.add_argument('--cases', default='', help='只运行指定的用例，以逗号分隔')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='基线文件路径')
+    parser.add_argument('--update-baseline', action='store_true', help='把本次结果写入基线文件')
+    parser.add_argument('--reseed', action='store_true', help='重新生成数据库')
+    parser.add_argument('--latency-threshold', type=float, default=0.5, help='p50延迟允许增长的比例（默认0.5）')
+    parser.add_argument('--latency-floor-ms', type=float, default=2.0, help='小于该毫秒数的延迟增长视为噪声')
+    parser.add_argument('--query-slack', type=int, default=0, help='SQL语句数允许增加的条数（默认0）')
+    parser.add_argument('--memory-threshold', type=float, default=0.5, help='内存峰值允许增长的比例（默认0.5）')
+    parser.add_argument('--memory-floor-kb', type=float, default=256.0, help='小于该KB数的内存增长视为噪声')
+    parser.add_argument('--seed-db', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, SERVER_DIR)
+
+    if args.seed_db is not None:
+        seed_database(args.seed_db)
+        return
+    if args.worker:
+        names = set(filter(None, args.cases.split(',')))
+        print(json.dumps(run_cases(args.repeat, names)))
+        return
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    results = {}
+    for size in [int(size) for size in args.sizes.split(',') if size.strip()]:
+        results[str(size)] = run_size(size, args)
+
+    print_table(results, baselines)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, 'latest.json'), 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        for size, cases in results.items():
+            baselines.setdefault(size, {}).update(cases)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"\n基线已更新：{args.baseline}")
+        return
+
+    regressions, missing = compare(results, baselines, args)
+    if missing:
+        print("\n以下用例没有基线，未做比较（用 --update-baseline 补充）：")
+        for message in missing:
+            print(f"  {message}")
+    if regressions:
+        print("\n性能回归：")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print("\n未发现性能回归")
+
+
+if __name__ == '__main__':
+    main()
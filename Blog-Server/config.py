@@ -1,17 +1,115 @@
 import os
 
+from sqlalchemy.engine import URL
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(default)).strip().lower() in ('true', '1', 'yes', 'on')
+
+
+def engine_options(database_uri):
+    """根据数据库类型生成SQLALCHEMY_ENGINE_OPTIONS
+
+    MySQL等服务端数据库使用连接池参数和语句超时；SQLite是本地文件，不需要连接池调优。
+    """
+    backend = database_uri.split(':', 1)[0].split('+', 1)[0]
+    if backend == 'sqlite':
+        return {}
+
+    options = {
+        'pool_size': _env_int('DB_POOL_SIZE', 10),  # 常驻连接数
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', 20),  # 高峰时允许额外创建的连接数
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30),  # 等待空闲连接的最长时间，单位：秒
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', 1800),  # 连接最长使用时间，需小于MySQL的wait_timeout，单位：秒
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True),  # 取出连接前检测是否可用
+    }
+
+    # 单条查询的最长执行时间，0表示不限制，单位：毫秒
+    statement_timeout = _env_int('DB_STATEMENT_TIMEOUT_MS', 0)
+    if statement_timeout > 0:
+        if backend == 'mysql':
+            # max_execution_time只对只读SELECT生效
+            options['connect_args'] = {'init_command': f'SET SESSION max_execution_time={statement_timeout}'}
+        elif backend == 'postgresql':
+            options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+
 class Config:
-    # MySQL数据库配置
-    MYSQL_HOST = 'localhost'
-    MYSQL_PORT = 3306
-    MYSQL_USER = 'root'
-    MYSQL_PASSWORD = '521365zhh'
-    MYSQL_DB = 'blog_db'
+    # MySQL数据库配置（未设置DATABASE_URL时使用）
+    MYSQL_HOST = os.environ.get('MYSQL_HOST', 'localhost')
+    MYSQL_PORT = _env_int('MYSQL_PORT', 3306)
+    MYSQL_USER = os.environ.get('MYSQL_USER', 'root')
+    MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD', '')  # 不在代码中保存密码，通过环境变量设置
+    MYSQL_DB = os.environ.get('MYSQL_DB', 'blog_db')
     
     # Flask配置
-    SECRET_KEY = 'your-secret-key-here'
-    SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}'
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-here')
+    # 设置DATABASE_URL环境变量时使用该数据库，如 sqlite:///blog.db（本地测试、基准测试）
+    # 由URL.create转义用户名和密码中的@、:、/等字符
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or URL.create(
+        'mysql+pymysql',
+        username=MYSQL_USER,
+        password=MYSQL_PASSWORD or None,
+        host=MYSQL_HOST,
+        port=MYSQL_PORT,
+        database=MYSQL_DB,
+    ).render_as_string(hide_password=False)
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # 浏览量写缓冲配置
+    VIEW_BUFFER_FLUSH_INTERVAL = 5  # 定时落库间隔，单位：秒
+    VIEW_BUFFER_MAX_PENDING = 500  # 未落库的浏览次数达到该值时立即落库
+
+    # 全文检索配置
+    SEARCH_PREFIX_LIMIT = 50  # 英文查询词最多展开的前缀匹配词数（如pyth匹配python）
+
+    # 响应缓存配置
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_MAX_ENTRIES = 512  # 最多缓存的响应条数，超出后淘汰最久未使用的
+    RESPONSE_CACHE_TTL = 60  # 缓存有效期，单位：秒
+
+    # 热门文章排行配置
+    TRENDING_HALF_LIFE_HOURS = 24  # 热度半衰期，单位：小时
+    TRENDING_TOP_K = 50  # 内存中维护的排行长度
+    TRENDING_REBUILD_INTERVAL = 3600  # 后台从数据库重新计算基础热度的间隔，单位：秒
+
+    # 响应压缩配置
+    COMPRESS_MIN_SIZE = 1024  # 小于该字节数的响应不压缩
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 5
+    COMPRESS_CACHE_ENTRIES = 256  # 按(ETag, 编码)缓存的压缩结果条数
+
+    # JSON序列化配置
+    JSON_USE_ORJSON = _env_bool('JSON_USE_ORJSON', True)  # 安装了orjson时用它序列化响应，否则使用标准库json
+
+    # 请求体大小上限（包括没有声明Content-Length的分块上传），超过时返回413，单位：字节
+    # 需要大于IMAGE_MAX_BYTES；更大规模的文章导入使用utils/import_articles.py
+    MAX_CONTENT_LENGTH = _env_int('MAX_CONTENT_LENGTH', 16 * 1024 * 1024)
+
+    # 项目图片上传配置
+    IMAGE_UPLOAD_DIR = os.path.join('static', 'uploads', 'projects')
+    IMAGE_URL_PREFIX = '/static/uploads/projects'
+    IMAGE_MAX_BYTES = _env_int('IMAGE_MAX_BYTES', 5 * 1024 * 1024)  # 单张图片大小上限，单位：字节
+    IMAGE_VARIANT_WIDTHS = (480, 960, 1440)  # 生成的缩放版本宽度（不超过原图宽度），单位：像素
+    IMAGE_WEBP_QUALITY = 80
+    IMAGE_JPEG_QUALITY = 85
+    IMAGE_WORKERS = 2  # 生成缩放版本的后台线程数
+
+    # 监控指标配置
+    METRICS_ENABLED = True  # 在/metrics以Prometheus文本格式输出请求和数据库指标
+
+    # 查询检查配置（开发/测试环境开启）
+    QUERY_GUARD_ENABLED = _env_bool('QUERY_GUARD_ENABLED', False)  # 统计每个请求的SQL语句数并检测N+1查询
+    QUERY_GUARD_N_PLUS_ONE_THRESHOLD = 5  # 同一请求中相同的SELECT执行次数达到该值时视为N+1查询
+    QUERY_GUARD_RAISE = _env_bool('QUERY_GUARD_RAISE', False)  # 检测到N+1查询时抛出异常，否则只记录日志
+    QUERY_GUARD_RAISE_ON_LAZY_LOAD = _env_bool('QUERY_GUARD_RAISE_ON_LAZY_LOAD', False)  # 请求中延迟加载关系时抛出异常
+    SLOW_QUERY_MS = _env_int('SLOW_QUERY_MS', 0)  # 记录执行时间超过该值的语句，0表示关闭，单位：毫秒
+
     # CORS配置
     CORS_ORIGINS = ['http://localhost:5173', 'http://127.0.0.1:5173', 'http://localhost:5174', 'http://127.0.0.1:5174']  # Vue开发服务器地址
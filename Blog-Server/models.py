@@ -10,7 +10,8 @@ class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    image_url = db.Column(db.String(500))  # 项目图片URL，格式：/static/uploads/projects/program{id}.{ext}
+    image_url = db.Column(db.String(500))  # 项目图片URL，格式：/static/uploads/projects/{sha256}.{ext}
+    image_variants = db.Column(db.Text)  # 缩放和WebP版本（JSON），后台生成完成前为空
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -21,6 +22,10 @@ class Project(db.Model):
 # 项目与文章的关联表（多对多关系）
 class ProjectArticle(db.Model):
     __tablename__ = 'project_articles'
+    __table_args__ = (
+        db.Index('uq_project_articles_project_article', 'project_id', 'article_id', unique=True),
+        db.Index('ix_project_articles_article_id', 'article_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
@@ -29,10 +34,20 @@ class ProjectArticle(db.Model):
 
 class Article(db.Model):
     __tablename__ = 'articles'
+    __table_args__ = (
+        # 已发布文章按时间倒序分页、游标分页和归档筛选
+        db.Index('ix_articles_published_created', 'is_published', 'created_at', 'id'),
+        # 热门文章按浏览量排序
+        db.Index('ix_articles_published_views', 'is_published', 'view_count'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
-    content = db.Column(db.Text, nullable=False)
+    # 正文默认延迟加载（body组），需要正文的查询通过load_only(*columns_for(...))或直接查询列显式读取
+    content = db.deferred(db.Column(db.Text, nullable=False), group='body')
+    content_html = db.deferred(db.Column(db.Text), group='body')  # 写入时渲染并净化的HTML
+    toc = db.deferred(db.Column(db.Text), group='body')  # 标题目录，JSON格式
+    word_count = db.Column(db.Integer)  # 字数（中文按字、英文按单词计）
     excerpt = db.Column(db.String(500))
     read_time = db.Column(db.Integer, default=5)  # 单位：分钟
     view_count = db.Column(db.Integer, default=0)  # 浏览量
@@ -50,8 +65,21 @@ class Article(db.Model):
     projects = db.relationship('Project', secondary='project_articles', back_populates='articles')
 
 
+# 已发布文章的月度归档汇总（由services/archive.py随文章写入同步维护）
+class ArticleArchive(db.Model):
+    __tablename__ = 'article_archives'
+
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    article_count = db.Column(db.Integer, nullable=False, default=0)
+
+
 class ArticleTag(db.Model):
     __tablename__ = 'article_tags'
+    __table_args__ = (
+        db.Index('uq_article_tags_article_tag', 'article_id', 'tag_id', unique=True),
+        db.Index('ix_article_tags_tag_id', 'tag_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     article_id = db.Column(db.Integer, db.ForeignKey('articles.id'), nullable=False)
@@ -60,9 +88,17 @@ class ArticleTag(db.Model):
 
 class Tag(db.Model):
     __tablename__ = 'tags'
+    __table_args__ = (
+        # 标签云按文章数取前N个
+        db.Index('ix_tags_published_count', 'published_count'),
+        db.Index('ix_tags_article_count', 'article_count'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), unique=True, nullable=False)
+    # 关联的文章数和其中已发布的文章数（由services/tags.py随文章-标签关联的写入同步维护）
+    article_count = db.Column(db.Integer, nullable=False, default=0)
+    published_count = db.Column(db.Integer, nullable=False, default=0)
 
     # 关系
     articles = db.relationship('Article', secondary='article_tags', back_populates='tags')
@@ -70,6 +106,10 @@ class Tag(db.Model):
 
 class Comment(db.Model):
     __tablename__ = 'comments'
+    __table_args__ = (
+        # 按文章读取已审核评论并按时间排序
+        db.Index('ix_comments_article_approved_created', 'article_id', 'is_approved', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     article_id = db.Column(db.Integer, db.ForeignKey('articles.id'), nullable=False)
@@ -0,0 +1,117 @@
+"""
+响应序列化：把ORM对象或查询返回的行（Row）转换为接口输出的字典
+
+同一组fields的取值函数只构建一次；列表中大量文章的日期相同，日期字符串按天缓存，
+不再对每一行调用strftime。
+"""
+
+import json
+from functools import lru_cache
+from operator import attrgetter
+
+from models import db, ArticleTag, Tag
+
+
+# 以JSON文本保存、输出时需要解析的列
+JSON_TEXT_FIELDS = ('image_variants',)
+
+
+@lru_cache(maxsize=4096)
+def _date_string(day):
+    return day.isoformat()
+
+
+def format_date(value):
+    """datetime -> 'YYYY-MM-DD'，空值返回空字符串"""
+    if value is None:
+        return ''
+    return _date_string(value.date())
+
+
+def format_datetime(value):
+    """datetime -> 'YYYY-MM-DD HH:MM:SS'，空值返回空字符串"""
+    if value is None:
+        return ''
+    return value.isoformat(' ', 'seconds')
+
+
+def _date_getter(name):
+    get = attrgetter(name)
+    return lambda obj: format_date(get(obj))
+
+
+def _json_getter(name):
+    get = attrgetter(name)
+    return lambda obj: json.loads(get(obj) or 'null')
+
+
+@lru_cache(maxsize=128)
+def _getters(fields, computed):
+    """返回fields对应的 [(字段名, 取值函数)]，computed中的字段取值函数为None，由调用方提供"""
+    getters = []
+    for name in fields:
+        if name in computed:
+            getters.append((name, None))
+        elif name in ('created_at', 'updated_at'):
+            getters.append((name, _date_getter(name)))
+        elif name in JSON_TEXT_FIELDS:
+            getters.append((name, _json_getter(name)))
+        else:
+            getters.append((name, attrgetter(name)))
+    return tuple(getters)
+
+
+def article_tags_for(article_ids):
+    """一次查询获取多篇文章的标签，返回 {文章ID: [标签名]}"""
+    article_tags = {}
+    if article_ids:
+        tag_results = db.session.query(
+            ArticleTag.article_id,
+            Tag.name
+        ).join(Tag).filter(ArticleTag.article_id.in_(article_ids)).all()
+        for article_id, tag_name in tag_results:
+            article_tags.setdefault(article_id, []).append(tag_name)
+    return article_tags
+
+
+def serialize_article(article, fields, article_tags):
+    """按fields输出文章字段，article可以是Article对象或查询返回的行"""
+    item = {}
+    for name, get in _getters(fields, ('tags',)):
+        item[name] = get(article) if get is not None else article_tags.get(article.id, [])
+    return item
+
+
+def serialize_articles(articles, fields, article_tags):
+    return [serialize_article(article, fields, article_tags) for article in articles]
+
+
+def serialize_project(project, fields, extra):
+    """按fields输出项目字段，extra提供不在projects表中的字段（article_count、articles）"""
+    item = {}
+    for name, get in _getters(fields, frozenset(extra)):
+        item[name] = get(project) if get is not None else extra[name]
+    return item
+
+
+def serialize_comment(comment):
+    """评论的创建时间精确到秒"""
+    return {
+        'id': comment.id,
+        'author_name': comment.author_name,
+        'author_email': comment.author_email,
+        'content': comment.content,
+        'created_at': format_datetime(comment.created_at),
+    }
+
+
+def serialize_hot_article(article):
+    return {'id': article.id, 'title': article.title, 'view_count': article.view_count}
+
+
+def serialize_archive(year, month, count):
+    return {'date': f'{year}年{month:02d}月', 'count': count}
+
+
+def serialize_tag(name, count):
+    return {'name': name, 'count': count}
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+from sqlalchemy import extract, func
+from sqlalchemy.exc import IntegrityError
+from models import db, Article, ArticleArchive
+
+_table = ArticleArchive.__table__
+
+
+def month_range(archive):
+    """把"2025年11月"或"2025-11"解析为该月的[起始时间, 下月起始时间)"""
+    year_month = archive.replace('年', '-').replace('月', '').strip()
+    try:
+        year, month = (int(part) for part in year_month.split('-'))
+        start = datetime(year, month, 1)
+    except ValueError as e:
+        raise ValueError(f'无效的归档月份: {archive}') from e
+
+    if month == 12:
+        return start, datetime(year + 1, 1, 1)
+    return start, datetime(year, month + 1, 1)
+
+
+def adjust(created_at, delta):
+    """按文章创建时间所在月份增减归档计数，与文章写入处于同一事务
+
+    汇总表还没有构建（为空）时不做任何修改：只插入这一个月份会让其他月份的归档消失，
+    由迁移脚本或首次读取归档时从文章表整体构建。
+    """
+    if created_at is None or not delta:
+        return
+
+    condition = (_table.c.year == created_at.year) & (_table.c.month == created_at.month)
+    result = db.session.execute(
+        _table.update().where(condition).values(article_count=_table.c.article_count + delta)
+    )
+    if result.rowcount or not is_built():
+        return
+
+    # 该月份还没有汇总记录；并发插入冲突时退回到更新
+    try:
+        with db.session.begin_nested():
+            db.session.execute(_table.insert().values(
+                year=created_at.year,
+                month=created_at.month,
+                article_count=max(delta, 0)
+            ))
+    except IntegrityError:
+        db.session.execute(
+            _table.update().where(condition).values(article_count=_table.c.article_count + delta)
+        )
+
+
+def is_built():
+    """汇总表中是否已有数据"""
+    return db.session.query(_table.c.year).limit(1).first() is not None
+
+
+def rebuild():
+    """根据文章表重新计算全部月度归档（调用方负责提交事务）"""
+    year = extract('year', Article.created_at)
+    month = extract('month', Article.created_at)
+    rows = db.session.query(year, month, func.count(Article.id)) \
+        .filter(Article.is_published.is_(True)) \
+        .group_by(year, month) \
+        .all()
+
+    db.session.execute(_table.delete())
+    if rows:
+        db.session.execute(_table.insert(), [
+            {'year': int(row_year), 'month': int(row_month), 'article_count': count}
+            for row_year, row_month, count in rows
+        ])
+
+
+def get_archives():
+    """读取月度归档，按月份降序返回[(year, month, count)]；汇总表为空时先从文章表构建"""
+    query = db.session.query(_table.c.year, _table.c.month, _table.c.article_count) \
+        .filter(_table.c.article_count > 0) \
+        .order_by(_table.c.year.desc(), _table.c.month.desc())
+    rows = query.all()
+
+    if not rows and db.session.query(Article.id).filter(Article.is_published.is_(True)).first():
+        rebuild()
+        db.session.commit()
+        rows = query.all()
+
+    return rows
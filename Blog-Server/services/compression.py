@@ -0,0 +1,107 @@
+import gzip
+import threading
+from collections import OrderedDict
+
+from flask import request
+from utils.http_cache import ETAG_SUFFIXES
+
+try:
+    import brotli
+except ImportError:  # 未安装brotli时只使用gzip
+    brotli = None
+
+# 值得压缩的响应类型
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/css',
+    'text/html',
+    'text/markdown',
+    'text/plain',
+}
+
+
+class Compressor:
+    """按Accept-Encoding对响应进行br/gzip压缩
+
+    带强ETag的响应以(ETag, 编码)为键缓存压缩结果，同一版本的内容只压缩一次。
+    """
+
+    def __init__(self, min_size=1024, gzip_level=6, brotli_quality=5, cache_entries=256):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache_entries = cache_entries
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # (etag, encoding) -> 压缩后的响应体
+
+    def init_app(self, app):
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', self.min_size)
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', self.gzip_level)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', self.brotli_quality)
+        self.cache_entries = app.config.get('COMPRESS_CACHE_ENTRIES', self.cache_entries)
+        app.extensions['compressor'] = self
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        # 响应内容随Accept-Encoding变化，告知中间缓存按编码区分
+        response.vary.add('Accept-Encoding')
+
+        encoding = self._choose_encoding()
+        if encoding is None or response.content_length is None or response.content_length < self.min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        key = (etag, encoding) if etag and not weak else None
+
+        body = self._cache_get(key)
+        if body is None:
+            body = self._compress(response.get_data(), encoding)
+            self._cache_set(key, body)
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            # 压缩后的ETag带上编码后缀，区分不同编码的表示
+            response.set_etag(etag + ETAG_SUFFIXES[encoding], weak=weak)
+        return response
+
+    def _choose_encoding(self):
+        accept = request.accept_encodings
+        if brotli is not None and accept['br']:
+            return 'br'
+        if accept['gzip']:
+            return 'gzip'
+        return None
+
+    def _compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level)
+
+    def _cache_get(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+            return body
+
+    def _cache_set(self, key, body):
+        if key is None or not self.cache_entries:
+            return
+        with self._lock:
+            self._cache[key] = body
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+
+compressor = Compressor()
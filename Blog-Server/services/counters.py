@@ -0,0 +1,66 @@
+from sqlalchemy import case, func, select
+from models import db, Article
+
+# 允许原子增减的文章计数列
+COUNTER_COLUMNS = ('view_count', 'like_count', 'comment_count')
+
+_table = Article.__table__
+
+
+def _counter_column(column):
+    if column not in COUNTER_COLUMNS:
+        raise ValueError(f'不支持的计数列: {column}')
+    return _table.c[column]
+
+
+def get(article_id, column):
+    """只读取文章的单个计数列；文章不存在时返回None"""
+    col = _counter_column(column)
+    row = db.session.execute(select(col).where(_table.c.id == article_id)).first()
+    if row is None:
+        return None
+    return row[0] or 0
+
+
+def increment(article_id, column, delta=1):
+    """在数据库端原子地增减文章计数（结果不小于0），返回新值；文章不存在时返回None
+
+    只发出一条UPDATE语句，不加载文章实体，并发请求不会丢失更新。调用方负责提交事务。
+    """
+    col = _counter_column(column)
+    new_value = case((col + delta < 0, 0), else_=col + delta)
+    stmt = _table.update().where(_table.c.id == article_id)
+    dialect = db.session.get_bind().dialect
+
+    if dialect.update_returning:
+        row = db.session.execute(_with_values(stmt, col, new_value).returning(col)).first()
+        return None if row is None else row[0]
+
+    if dialect.name == 'mysql':
+        # MySQL不支持UPDATE ... RETURNING，借助LAST_INSERT_ID(expr)在同一次往返中取回新值
+        result = db.session.execute(_with_values(stmt, col, func.last_insert_id(new_value)))
+        if result.rowcount == 0:
+            return None
+        return result.lastrowid
+
+    result = db.session.execute(_with_values(stmt, col, new_value))
+    if result.rowcount == 0:
+        return None
+    return get(article_id, column)
+
+
+def bulk_increment(column, deltas):
+    """用一条UPDATE ... CASE语句批量增加多篇文章的计数，deltas为{article_id: 增量}"""
+    if not deltas:
+        return 0
+    col = _counter_column(column)
+    stmt = _table.update().where(_table.c.id.in_(deltas.keys()))
+    result = db.session.execute(
+        _with_values(stmt, col, col + case(deltas, value=_table.c.id, else_=0))
+    )
+    return result.rowcount
+
+
+def _with_values(stmt, col, value):
+    # 计数变化不代表内容更新，保持updated_at不变
+    return stmt.values({col: value, _table.c.updated_at: _table.c.updated_at})
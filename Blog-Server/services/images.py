@@ -0,0 +1,262 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from models import db, Project
+from services.response_cache import response_cache, PROJECTS
+from utils.request_limits import format_size
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # 未安装Pillow时只保存原图，不生成缩放版本
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# 按文件头识别的图片格式 -> 扩展名
+_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+
+# 缩放版本的回退格式（不支持WebP的浏览器使用）
+_FALLBACK_FORMATS = {'jpg': ('JPEG', 'jpg'), 'png': ('PNG', 'png'), 'gif': ('PNG', 'png'), 'webp': ('PNG', 'png')}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ImageUploadError(ValueError):
+    """上传的文件不是支持的图片，或超过大小限制"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def detect_format(header):
+    """根据文件头判断图片格式，返回扩展名；不是支持的图片时返回None"""
+    for signature, ext in _SIGNATURES:
+        if header.startswith(signature):
+            return ext
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+class ImagePipeline:
+    """项目图片上传处理
+
+    - 上传文件分块写入临时文件，同时计算sha256并检查大小上限，不把整个文件读入内存
+    - 按文件头校验图片格式，扩展名以文件头为准
+    - 以内容哈希命名，相同图片只保存一份，多个项目共用
+    - 在后台线程池中生成多个宽度的WebP和回退格式版本，完成后写入Project.image_variants
+    """
+
+    def __init__(self, upload_dir=os.path.join('static', 'uploads', 'projects'),
+                 url_prefix='/static/uploads/projects', max_bytes=5 * 1024 * 1024,
+                 widths=(480, 960, 1440), webp_quality=80, jpeg_quality=85, workers=2):
+        self.upload_dir = upload_dir
+        self.url_prefix = url_prefix
+        self.max_bytes = max_bytes
+        self.widths = widths
+        self.webp_quality = webp_quality
+        self.jpeg_quality = jpeg_quality
+        self.workers = workers
+        self._app = None
+        self._executor = None
+
+    def init_app(self, app):
+        self._app = app
+        self.upload_dir = app.config.get('IMAGE_UPLOAD_DIR', self.upload_dir)
+        self.url_prefix = app.config.get('IMAGE_URL_PREFIX', self.url_prefix)
+        self.max_bytes = app.config.get('IMAGE_MAX_BYTES', self.max_bytes)
+        self.widths = tuple(sorted(app.config.get('IMAGE_VARIANT_WIDTHS', self.widths)))
+        self.webp_quality = app.config.get('IMAGE_WEBP_QUALITY', self.webp_quality)
+        self.jpeg_quality = app.config.get('IMAGE_JPEG_QUALITY', self.jpeg_quality)
+        self.workers = app.config.get('IMAGE_WORKERS', self.workers)
+        app.extensions['image_pipeline'] = self
+
+        if Image is None:
+            logger.warning('未安装Pillow，上传的项目图片不会生成缩放和WebP版本')
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='image-variants')
+            atexit.register(self._executor.shutdown)
+
+    # ---------- 请求线程：保存原图 ----------
+
+    def check_content_length(self, content_length):
+        """请求声明的大小已经超过上限时直接拒绝，在解析表单（读取请求体）之前调用"""
+        if content_length is not None and content_length > self.max_bytes + CHUNK_SIZE:
+            raise ImageUploadError(self._too_large_message(), 413)
+
+    def save_upload(self, file):
+        """把上传文件保存为 {sha256}.{ext}，返回原图URL；格式不支持或过大时抛出ImageUploadError"""
+        os.makedirs(self.upload_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.upload_dir, suffix='.part')
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            header = b''
+            with os.fdopen(fd, 'wb') as out:
+                while True:
+                    chunk = file.stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise ImageUploadError(self._too_large_message(), 413)
+                    if len(header) < 16:
+                        header += chunk[:16 - len(header)]
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            ext = detect_format(header)
+            if ext is None:
+                raise ImageUploadError('文件不是支持的图片格式（PNG、JPG、GIF、WEBP）')
+
+            filename = f'{digest.hexdigest()}.{ext}'
+            path = os.path.join(self.upload_dir, filename)
+            if os.path.exists(path):
+                os.remove(temp_path)  # 相同内容的图片已存在
+            else:
+                os.replace(temp_path, path)
+            return f'{self.url_prefix}/{filename}'
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _too_large_message(self):
+        return f'图片大小不能超过 {format_size(self.max_bytes)}'
+
+    def existing_variants(self, image_url):
+        """同一内容的图片已有项目生成过缩放版本时直接复用"""
+        return db.session.query(Project.image_variants) \
+            .filter(Project.image_url == image_url, Project.image_variants.isnot(None)) \
+            .limit(1).scalar()
+
+    def generate_variants(self, project_id, image_url):
+        """提交后台任务生成缩放版本（调用方需先提交事务，后台线程才能读到项目）"""
+        if self._executor is None:
+            return None
+        return self._executor.submit(self._generate_and_record, project_id, image_url)
+
+    # ---------- 后台线程：生成缩放版本 ----------
+
+    def _generate_and_record(self, project_id, image_url):
+        try:
+            variants = self._render_variants(image_url)
+        except Exception:
+            logger.exception('生成项目图片缩放版本失败: %s', image_url)
+            return None
+
+        with self._app.app_context():
+            try:
+                # 期间项目换了图片时不覆盖
+                db.session.query(Project) \
+                    .filter(Project.id == project_id, Project.image_url == image_url) \
+                    .update({Project.image_variants: json.dumps(variants)}, synchronize_session=False)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception('保存项目图片缩放版本失败: 项目 %s', project_id)
+                return None
+        # 已缓存的项目列表中还没有缩放版本
+        response_cache.invalidate(PROJECTS)
+        return variants
+
+    def _render_variants(self, image_url):
+        """为原图生成各宽度（不超过原图宽度）的WebP和回退格式版本，已存在的文件不重复生成
+
+        返回 {'width': 原图宽度, 'webp': [{'width', 'url'}], 'fallback': [{'width', 'url'}]}
+        """
+        filename = image_url.rsplit('/', 1)[-1]
+        stem, ext = filename.rsplit('.', 1)
+        source = os.path.join(self.upload_dir, filename)
+        fallback_format, fallback_ext = _FALLBACK_FORMATS[ext]
+
+        with Image.open(source) as original:
+            image = ImageOps.exif_transpose(original)
+            image.load()
+        # 调色板等模式缩放时只能用最近邻插值，先转换为RGB/RGBA
+        if image.mode not in ('RGB', 'RGBA', 'L'):
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+        widths = [width for width in self.widths if width < image.width] + [image.width]
+
+        variants = {'width': image.width, 'webp': [], 'fallback': []}
+        for width in widths:
+            resized = None
+            for kind, image_format, variant_ext in (('webp', 'WEBP', 'webp'),
+                                                     ('fallback', fallback_format, fallback_ext)):
+                # 原图宽度的回退版本（以及原图本身是WebP时的WebP版本）就是原图
+                if width == image.width and (kind == 'fallback' or ext == 'webp'):
+                    variants[kind].append({'width': width, 'url': image_url})
+                    continue
+
+                variant_name = f'{stem}_{width}.{variant_ext}'
+                variant_path = os.path.join(self.upload_dir, variant_name)
+                if not os.path.exists(variant_path):
+                    if resized is None:
+                        resized = _resize(image, width)
+                    _save_atomic(_prepare_mode(resized, image_format), variant_path, image_format,
+                                 quality=self.jpeg_quality if image_format == 'JPEG' else self.webp_quality)
+                variants[kind].append({'width': width, 'url': f'{self.url_prefix}/{variant_name}'})
+        return variants
+
+    # ---------- 清理 ----------
+
+    def release(self, image_url, variants=None):
+        """项目不再使用该图片时删除原图和缩放版本（在提交事务后调用）；仍有其他项目使用同一内容时保留"""
+        if not image_url or not image_url.startswith(self.url_prefix + '/'):
+            return
+        if db.session.query(Project.id).filter(Project.image_url == image_url).first():
+            return
+
+        urls = {image_url}
+        if variants:
+            for kind in ('webp', 'fallback'):
+                urls.update(item['url'] for item in json.loads(variants).get(kind, []))
+        for url in urls:
+            if not url.startswith(self.url_prefix + '/'):
+                continue
+            path = os.path.join(self.upload_dir, url.rsplit('/', 1)[-1])
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.warning('删除项目图片失败: %s', path, exc_info=True)
+
+
+def _resize(image, width):
+    height = max(round(image.height * width / image.width), 1)
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def _prepare_mode(image, image_format):
+    # JPEG不支持透明通道和调色板
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        return image.convert('RGB')
+    if image_format == 'WEBP' and image.mode == 'L':
+        return image.convert('RGB')
+    return image
+
+
+def _save_atomic(image, path, image_format, quality):
+    # 先写临时文件再改名，并发生成同一版本或读取时不会看到写了一半的文件
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.part'
+    options = {'optimize': True}
+    if image_format in ('JPEG', 'WEBP'):
+        options['quality'] = quality
+    image.save(temp_path, image_format, **options)
+    os.replace(temp_path, path)
+
+
+image_pipeline = ImagePipeline()
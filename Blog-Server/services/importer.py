@@ -0,0 +1,376 @@
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import text
+
+from models import db, Article, ArticleTag, Project, ProjectArticle
+from services import archive as archive_service
+from services.render import render_markdown
+from services.search import search_index
+from services.tags import adjust_counts, resolve_tags, normalize_names
+
+_article_table = Article.__table__
+_article_tag_table = ArticleTag.__table__
+_project_article_table = ProjectArticle.__table__
+
+TRUE_VALUES = {'true', 'yes', '1', 'on'}
+
+# front-matter支持的字段 -> 文章数据字典中的键
+FRONT_MATTER_KEYS = {
+    'title': 'title',
+    'tags': 'tags',
+    'date': 'created_at',
+    'created_at': 'created_at',
+    'published': 'is_published',
+    'is_published': 'is_published',
+    'program': 'program',
+    'program_id': 'program_id',
+    'program_name': 'program_name',
+    'excerpt': 'excerpt',
+    'read_time': 'read_time',
+}
+
+
+def parse_markdown(text, source=None):
+    """解析带front-matter的Markdown文件，返回文章数据字典
+
+    front-matter示例：
+        ---
+        title: 文章标题
+        tags: [Python, Flask]   # 也可以写成块列表，每行一个“  - Python”
+        date: 2024-05-01
+        published: true
+        program: 项目名称或ID
+        ---
+    没有title时使用第一个一级标题，再没有时使用文件名。
+    无法识别的字段不导入，字段名记录在_unknown_keys中，由导入报告给出警告。
+    """
+    item = {}
+    body = text
+    if text.startswith('---'):
+        lines = text.splitlines()
+        for end, line in enumerate(lines[1:], start=1):
+            if line.strip() == '---':
+                item, unknown = _parse_front_matter(lines[1:end])
+                if unknown:
+                    item['_unknown_keys'] = unknown
+                body = '\n'.join(lines[end + 1:]).lstrip('\n')
+                break
+
+    item['content'] = body
+    if not item.get('title'):
+        for line in body.splitlines():
+            if line.startswith('# '):
+                item['title'] = line[2:].strip()
+                break
+        else:
+            if source:
+                item['title'] = os.path.splitext(os.path.basename(source))[0]
+    return item
+
+
+def iter_markdown_dir(directory):
+    """按文件名顺序读取目录下的.md文件"""
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.md'):
+            continue
+        path = os.path.join(directory, name)
+        with open(path, encoding='utf-8') as f:
+            item = parse_markdown(f.read(), source=name)
+        item['source'] = name
+        yield item
+
+
+def iter_jsonl(lines):
+    """逐行解析JSONL，无法解析的行以带_error的字典返回，由导入过程记为失败"""
+    for line_no, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError('每行必须是一个JSON对象')
+        except ValueError as e:
+            item = {'_error': f'JSON解析失败: {e}'}
+        item.setdefault('source', f'line {line_no}')
+        yield item
+
+
+def import_articles(items, chunk_size=200):
+    """分块批量导入文章，每块一个事务
+
+    每块内批量解析标签和项目，批量插入文章和关联。某块写入失败时回滚，
+    再逐条重试以定位出错的条目。
+    返回导入报告：成功数、失败数、逐条错误、警告和吞吐量。
+    """
+    started = time.perf_counter()
+    report = {'imported': 0, 'failed': 0, 'errors': [], 'warnings': [], 'article_ids': []}
+
+    chunk = []
+    for index, item in enumerate(items):
+        unknown = item.pop('_unknown_keys', None)
+        if unknown:
+            warning = f"忽略了无法识别的front-matter字段: {', '.join(unknown)}"
+            report['warnings'].append(_entry(index, item, warning=warning))
+        error = _validate(item)
+        if error:
+            _record_error(report, index, item, error)
+            continue
+        chunk.append((index, item))
+        if len(chunk) >= chunk_size:
+            _import_chunk(chunk, report)
+            chunk = []
+    if chunk:
+        _import_chunk(chunk, report)
+
+    elapsed = time.perf_counter() - started
+    report['elapsed_seconds'] = round(elapsed, 3)
+    report['articles_per_second'] = round(report['imported'] / elapsed, 1) if elapsed > 0 else 0.0
+    return report
+
+
+def _import_chunk(chunk, report):
+    try:
+        article_ids = _insert_chunk(chunk)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        if len(chunk) == 1:
+            index, item = chunk[0]
+            _record_error(report, index, item, str(e))
+            return
+        for entry in chunk:
+            _import_chunk([entry], report)
+        return
+
+    report['imported'] += len(article_ids)
+    report['article_ids'].extend(article_ids)
+
+    # 提交后同步全文索引
+    for article_id, (_, item) in zip(article_ids, chunk):
+        if item['_row']['is_published']:
+            search_index.index_article(
+                article_id, item['_row']['title'], item['_row']['excerpt'],
+                item['_row']['content'], item['_tags']
+            )
+
+
+def _insert_chunk(chunk):
+    now = datetime.utcnow()
+    rows = []
+    for _, item in chunk:
+        rendered = render_markdown(item['content'])
+        row = {
+            'title': item['title'],
+            'content': item['content'],
+            'content_html': rendered['content_html'],
+            'toc': rendered['toc'],
+            'word_count': rendered['word_count'],
+            'excerpt': item.get('excerpt') or rendered['excerpt'],
+            'read_time': item.get('read_time') or rendered['read_time'],
+            'view_count': 0,
+            'like_count': 0,
+            'comment_count': 0,
+            'is_published': _to_bool(item.get('is_published', True)),
+            'created_at': _to_datetime(item.get('created_at')) or now,
+            'updated_at': now,
+            'program_name': None,
+        }
+        item['_row'] = row
+        item['_tags'] = normalize_names(item.get('tags'))
+        rows.append(row)
+
+    # 批量解析项目（按ID或名称）
+    projects = _resolve_projects([item for _, item in chunk])
+    for _, item in chunk:
+        project = projects.get(item.get('program_id')) or projects.get(item.get('program_name'))
+        item['_project_id'] = project[0] if project else None
+        item['_row']['program_name'] = project[1] if project else None
+
+    article_ids = _insert_articles(rows)
+
+    # 批量解析标签并一次写入所有文章-标签关联
+    tag_ids = resolve_tags([name for _, item in chunk for name in item['_tags']])
+    article_tags = [
+        {'article_id': article_id, 'tag_id': tag_ids[name]}
+        for article_id, (_, item) in zip(article_ids, chunk)
+        for name in item['_tags'] if name in tag_ids
+    ]
+    if article_tags:
+        db.session.execute(_article_tag_table.insert(), article_tags)
+        # 按发布状态分别累计各标签新增的文章数
+        for published in (True, False):
+            adjust_counts(Counter(
+                tag_ids[name]
+                for (_, item), row in zip(chunk, rows) if row['is_published'] == published
+                for name in item['_tags'] if name in tag_ids
+            ), published)
+
+    project_articles = [
+        {'project_id': item['_project_id'], 'article_id': article_id}
+        for article_id, (_, item) in zip(article_ids, chunk) if item['_project_id']
+    ]
+    if project_articles:
+        db.session.execute(_project_article_table.insert(), project_articles)
+        # 项目的文章列表变化，更新项目的修改时间
+        Project.query.filter(Project.id.in_({item['project_id'] for item in project_articles})) \
+            .update({Project.updated_at: datetime.utcnow()}, synchronize_session=False)
+
+    # 按月份合并后同步月度归档
+    months = Counter(
+        (row['created_at'].year, row['created_at'].month) for row in rows if row['is_published']
+    )
+    for (year, month), count in months.items():
+        archive_service.adjust(datetime(year, month, 1), count)
+
+    return article_ids
+
+
+def _insert_articles(rows):
+    """插入文章并按参数顺序返回新ID"""
+    dialect = db.session.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = db.session.execute(
+            _article_table.insert().returning(_article_table.c.id, sort_by_parameter_order=True),
+            rows
+        )
+        return [row[0] for row in result]
+
+    if dialect.name == 'mysql':
+        # MySQL不支持INSERT ... RETURNING：用一条多行INSERT写入。行数预先确定的INSERT在InnoDB中
+        # 获得连续的自增ID（任何innodb_autoinc_lock_mode下都一样），由第一行的ID和步长推算其余ID
+        first_id = db.session.execute(_article_table.insert().values(rows)).lastrowid
+        step = db.session.execute(text('SELECT @@auto_increment_increment')).scalar()
+        return [first_id + i * step for i in range(len(rows))]
+
+    # 其他不支持RETURNING的数据库逐条插入（仍在同一事务内）
+    return [db.session.execute(_article_table.insert().values(**row)).inserted_primary_key[0] for row in rows]
+
+
+def _resolve_projects(items):
+    ids = {item['program_id'] for item in items if isinstance(item.get('program_id'), int)}
+    names = {item['program_name'] for item in items if item.get('program_name')}
+    if not ids and not names:
+        return {}
+
+    query = db.session.query(Project.id, Project.name)
+    if ids and names:
+        query = query.filter(db.or_(Project.id.in_(ids), Project.name.in_(names)))
+    elif ids:
+        query = query.filter(Project.id.in_(ids))
+    else:
+        query = query.filter(Project.name.in_(names))
+
+    projects = {}
+    for project_id, name in query.all():
+        projects[project_id] = (project_id, name)
+        projects.setdefault(name, (project_id, name))
+    return projects
+
+
+def _validate(item):
+    """校验条目并规范化项目字段，返回错误信息；合法时返回None"""
+    if '_error' in item:
+        return item['_error']
+    if not isinstance(item.get('title'), str) or not item['title'].strip():
+        return '缺少标题'
+    if not isinstance(item.get('content'), str) or not item['content'].strip():
+        return '缺少正文'
+    if len(item['title']) > 200:
+        return '标题超过200个字符'
+    if item.get('created_at') and _to_datetime(item['created_at']) is None:
+        return f"无法解析的时间: {item['created_at']}"
+
+    # 标签与front-matter一致：逗号分隔的字符串拆成列表，其他类型视为错误
+    tags = item.get('tags')
+    if isinstance(tags, str):
+        item['tags'] = [_unquote(part) for part in tags.split(',')]
+    elif tags is not None and (not isinstance(tags, list)
+                               or not all(isinstance(tag, str) for tag in tags)):
+        return '标签必须是字符串列表或逗号分隔的字符串'
+
+    # 兼容front-matter中的program字段（项目ID或名称）
+    program = item.pop('program', None)
+    if program is not None:
+        if isinstance(program, int) or str(program).isdigit():
+            item['program_id'] = int(program)
+        else:
+            item['program_name'] = str(program)
+    if isinstance(item.get('program_id'), str) and item['program_id'].isdigit():
+        item['program_id'] = int(item['program_id'])
+    return None
+
+
+def _record_error(report, index, item, error):
+    report['failed'] += 1
+    report['errors'].append(_entry(index, item, error=error))
+
+
+def _entry(index, item, **message):
+    return {'index': index, 'source': item.get('source'), 'title': item.get('title'), **message}
+
+
+def _parse_front_matter(lines):
+    """解析front-matter（YAML的简单子集）：key: value、行内列表 [a, b] 和块列表（缩进的 - item）
+
+    返回 (字段字典, 未识别的字段名列表)
+    """
+    item = {}
+    unknown = []
+    key = None  # 块列表所属的字段
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if stripped == '-' or stripped.startswith('- '):
+            if key is not None:
+                if not isinstance(item.get(key), list):
+                    item[key] = []
+                item[key].append(_unquote(stripped[1:]))
+            continue
+        if ':' not in line:
+            continue
+
+        name, value = line.split(':', 1)
+        name = name.strip()
+        if name not in FRONT_MATTER_KEYS:
+            unknown.append(name)
+            key = None
+            continue
+        key = FRONT_MATTER_KEYS[name]
+        value = _unquote(value)
+        if value.startswith('[') and value.endswith(']'):
+            value = [_unquote(part) for part in value[1:-1].split(',')]
+        elif key == 'tags':
+            value = [_unquote(part) for part in value.split(',')] if value else []
+        elif key == 'read_time' and value.isdigit():
+            value = int(value)
+        item[key] = value
+    return item, unknown
+
+
+def _unquote(value):
+    return value.strip().strip('"\'')
+
+
+def _to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_VALUES
+    return bool(value)
+
+
+def _to_datetime(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '').strip())
+    except ValueError:
+        return None
@@ -0,0 +1,216 @@
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from models import db
+
+# 直方图分桶上界
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # 单位：秒
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)  # 单位：秒
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """按标签分组的累计直方图，输出Prometheus文本格式"""
+
+    def __init__(self, name, help_text, buckets, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._series = {}  # 标签值 -> [各桶计数..., 总数, 总和]
+
+    def observe(self, value, labels=()):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_add_label(base, "le", _format_value(bound))} {cumulative}')
+            lines.append(f'{self.name}_bucket{_add_label(base, "le", "+Inf")} {series[-2]}')
+            lines.append(f'{self.name}_count{base} {series[-2]}')
+            lines.append(f'{self.name}_sum{base} {_format_value(series[-1])}')
+        return lines
+
+
+class Metrics:
+    """请求和数据库指标，通过/metrics以Prometheus文本格式输出
+
+    Flask请求钩子记录每个接口的请求延迟；SQLAlchemy游标事件累计本次请求的SQL语句数和SQL耗时；
+    包装连接池的connect()记录取连接的等待时间；抓取时读取连接池的占用情况。
+    热路径上只做计数和一次加锁的直方图更新。
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.request_latency = Histogram(
+            'http_request_duration_seconds', '请求处理耗时', LATENCY_BUCKETS, ('endpoint', 'method', 'status'))
+        self.request_queries = Histogram(
+            'http_request_db_queries', '单次请求执行的SQL语句数', QUERY_COUNT_BUCKETS, ('endpoint',))
+        self.request_sql_time = Histogram(
+            'http_request_db_seconds', '单次请求的SQL总耗时', LATENCY_BUCKETS, ('endpoint',))
+        self.pool_wait = Histogram(
+            'db_pool_checkout_wait_seconds', '从连接池取出连接的等待时间', POOL_WAIT_BUCKETS)
+        self._lock = threading.Lock()
+        self._statements = 0
+        self._statement_seconds = 0.0
+        self._pools = []
+
+    def init_app(self, app):
+        self.enabled = app.config.get('METRICS_ENABLED', self.enabled)
+        app.extensions['metrics'] = self
+        if not self.enabled:
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.render)
+
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        with app.app_context():
+            for engine in db.engines.values():
+                self._instrument_pool(engine.pool)
+
+    # ---------- Flask请求钩子 ----------
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_sql_time = 0.0
+
+    def _after_request(self, response):
+        started = g.get('metrics_started')
+        if started is None or request.endpoint == 'metrics':
+            return response
+        endpoint = request.endpoint or 'unknown'
+        self.request_latency.observe(
+            time.perf_counter() - started, (endpoint, request.method, str(response.status_code)))
+        self.request_queries.observe(g.metrics_queries, (endpoint,))
+        self.request_sql_time.observe(g.metrics_sql_time, (endpoint,))
+        return response
+
+    # ---------- SQLAlchemy事件 ----------
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('metrics_started')
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        with self._lock:
+            self._statements += 1
+            self._statement_seconds += elapsed
+        if has_request_context() and 'metrics_queries' in g:
+            g.metrics_queries += 1
+            g.metrics_sql_time += elapsed
+
+    def _instrument_pool(self, pool):
+        """包装pool.connect()，记录取连接（包括等待空闲连接和新建连接）的耗时"""
+        connect = pool.connect
+
+        def timed_connect():
+            started = time.perf_counter()
+            try:
+                return connect()
+            finally:
+                self.pool_wait.observe(time.perf_counter() - started)
+
+        pool.connect = timed_connect
+        self._pools.append(pool)
+
+    # ---------- 输出 ----------
+
+    def render(self):
+        lines = []
+        for histogram in (self.request_latency, self.request_queries, self.request_sql_time, self.pool_wait):
+            lines.extend(histogram.render())
+
+        with self._lock:
+            statements, statement_seconds = self._statements, self._statement_seconds
+        lines += [
+            '# HELP db_statements_total 执行的SQL语句总数',
+            '# TYPE db_statements_total counter',
+            f'db_statements_total {statements}',
+            '# HELP db_statement_seconds_total SQL语句总耗时',
+            '# TYPE db_statement_seconds_total counter',
+            f'db_statement_seconds_total {_format_value(statement_seconds)}',
+        ]
+        lines += self._render_pools()
+        return '\n'.join(lines) + '\n', 200, {'Content-Type': CONTENT_TYPE}
+
+    def _render_pools(self):
+        gauges = {
+            'db_pool_size': ('连接池常驻连接数', []),
+            'db_pool_checked_out': ('已被取出使用的连接数', []),
+            'db_pool_overflow': ('超出常驻连接数额外创建的连接数', []),
+            'db_pool_saturation': ('已取出连接数占连接上限的比例', []),
+        }
+        for index, pool in enumerate(self._pools):
+            # SQLite等使用的连接池没有大小限制，不输出占用情况
+            if not hasattr(pool, 'checkedout'):
+                continue
+            labels = f'{{pool="{index}"}}'
+            size = pool.size()
+            limit = size + max(getattr(pool, '_max_overflow', 0), 0)
+            checked_out = pool.checkedout()
+            gauges['db_pool_size'][1].append(f'db_pool_size{labels} {size}')
+            gauges['db_pool_checked_out'][1].append(f'db_pool_checked_out{labels} {checked_out}')
+            gauges['db_pool_overflow'][1].append(f'db_pool_overflow{labels} {max(pool.overflow(), 0)}')
+            gauges['db_pool_saturation'][1].append(
+                f'db_pool_saturation{labels} {_format_value(checked_out / limit if limit else 0.0)}')
+
+        lines = []
+        for name, (help_text, values) in gauges.items():
+            if values:
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge'] + values
+        return lines
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f'{{{pairs}}}'
+
+
+def _add_label(base, name, value):
+    if not base:
+        return f'{{{name}="{value}"}}'
+    return f'{base[:-1]},{name}="{value}"}}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = Metrics()
@@ -0,0 +1,157 @@
+import logging
+import os
+import sys
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# 查找调用位置时跳过的文件：本模块和第三方库
+_THIS_FILE = os.path.abspath(__file__)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(_THIS_FILE))
+
+MAX_LOGGED_STATEMENT = 500  # 日志中SQL和参数的最大长度
+
+
+class QueryGuardError(Exception):
+    """检测到N+1查询或请求中的延迟加载"""
+
+
+class QueryGuard:
+    """开发/测试环境的查询检查
+
+    - 统计每个请求执行的SQL语句数，通过X-Query-Count响应头返回
+    - 同一请求中相同的SELECT语句执行次数达到阈值时视为N+1查询，记录调用位置
+    - 可选：请求中触发关系的延迟加载时抛出异常（flush过程中的加载除外）
+    - 慢查询日志：记录超过阈值的语句、参数和所在接口，可以单独在生产环境开启
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.n_plus_one_threshold = 5
+        self.raise_errors = False
+        self.raise_on_lazy_load = False
+        self.slow_query_ms = 0
+
+    def init_app(self, app):
+        self.enabled = app.config.get('QUERY_GUARD_ENABLED', self.enabled)
+        self.n_plus_one_threshold = app.config.get('QUERY_GUARD_N_PLUS_ONE_THRESHOLD', self.n_plus_one_threshold)
+        self.raise_errors = app.config.get('QUERY_GUARD_RAISE', self.raise_errors)
+        self.raise_on_lazy_load = app.config.get('QUERY_GUARD_RAISE_ON_LAZY_LOAD', self.raise_on_lazy_load)
+        self.slow_query_ms = app.config.get('SLOW_QUERY_MS', self.slow_query_ms)
+        app.extensions['query_guard'] = self
+
+        if self.enabled:
+            app.before_request(self._before_request)
+            app.after_request(self._after_request)
+            event.listen(Session, 'do_orm_execute', self._check_lazy_load)
+            event.listen(Session, 'before_flush', self._flush_started)
+            event.listen(Session, 'after_flush_postexec', self._flush_finished)
+        if self.enabled or self.slow_query_ms:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    # ---------- 请求钩子 ----------
+
+    def _before_request(self):
+        g.query_guard_statements = Counter()
+        g.query_guard_reported = set()
+
+    def _after_request(self, response):
+        statements = g.get('query_guard_statements')
+        if statements is not None:
+            response.headers['X-Query-Count'] = str(sum(statements.values()))
+        return response
+
+    # ---------- 语句统计与慢查询 ----------
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_guard_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('query_guard_started')
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000 if started else 0.0
+
+        if self.slow_query_ms and elapsed_ms >= self.slow_query_ms:
+            logger.warning(
+                '慢查询 %.1fms [%s] %s 参数: %s',
+                elapsed_ms, _endpoint(), _truncate(statement), _truncate(repr(parameters))
+            )
+
+        if not self.enabled or not has_request_context():
+            return
+        statements = g.get('query_guard_statements')
+        if statements is None:
+            return
+        statements[statement] += 1
+
+        # 只有读语句的重复才是N+1的特征，批量写入按条执行是预期行为
+        count = statements[statement]
+        if (count >= self.n_plus_one_threshold
+                and statement not in g.query_guard_reported
+                and statement.lstrip()[:6].upper() == 'SELECT'):
+            g.query_guard_reported.add(statement)
+            message = (f'疑似N+1查询：{_endpoint()} 中相同语句已执行{count}次，'
+                       f'调用位置 {_caller()}：{_truncate(statement)}')
+            logger.warning(message)
+            if self.raise_errors:
+                raise QueryGuardError(message)
+
+    # ---------- 延迟加载检查 ----------
+
+    def _check_lazy_load(self, orm_execute_state):
+        if (not self.raise_on_lazy_load
+                or not orm_execute_state.is_select
+                or orm_execute_state.lazy_loaded_from is None
+                or orm_execute_state.session.info.get('query_guard_flushing')
+                or not has_request_context()):
+            return
+        path = orm_execute_state.loader_strategy_path
+        relationship = path[-1] if path else None
+        raise QueryGuardError(
+            f'请求 {_endpoint()} 中延迟加载了关系 {relationship}，'
+            f'调用位置 {_caller()}，请改用selectinload/joinedload或显式查询'
+        )
+
+    def _flush_started(self, session, flush_context, instances):
+        # flush时工作单元为删除多对多关联等会加载关系，这不是视图代码中的延迟加载
+        session.info['query_guard_flushing'] = True
+
+    def _flush_finished(self, session, flush_context):
+        session.info.pop('query_guard_flushing', None)
+
+
+def _endpoint():
+    if has_request_context():
+        return f'{request.method} {request.endpoint or request.path}'
+    return '-'
+
+
+def _caller():
+    """返回调用栈中第一个属于本项目（非第三方库、非本模块）的位置，找不到时返回第一个非第三方库的位置"""
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename != _THIS_FILE and 'site-packages' not in filename:
+            if filename.startswith(_PROJECT_ROOT):
+                return f'{os.path.relpath(filename, _PROJECT_ROOT)}:{frame.f_lineno}'
+            if fallback is None and not filename.startswith(sys.base_prefix):
+                fallback = f'{filename}:{frame.f_lineno}'
+        frame = frame.f_back
+    return fallback or '未知位置'
+
+
+def _truncate(text):
+    text = ' '.join(str(text).split())
+    if len(text) > MAX_LOGGED_STATEMENT:
+        return text[:MAX_LOGGED_STATEMENT] + '...'
+    return text
+
+
+query_guard = QueryGuard()
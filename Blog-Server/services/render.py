@@ -0,0 +1,131 @@
+import json
+import math
+import re
+from html import unescape
+
+import bleach
+import markdown
+
+from models import db, Article
+
+# 渲染结果允许保留的HTML标签和属性，其余一律过滤，防止XSS
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'del', 'div', 'em', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 'span', 'strong',
+    'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    '*': ['id'],
+    'a': ['href', 'title'],
+    'img': ['src', 'alt', 'title'],
+    'code': ['class'],
+    'div': ['class'],
+    'span': ['class'],
+    'td': ['align'],
+    'th': ['align'],
+}
+ALLOWED_PROTOCOLS = {'http', 'https', 'mailto'}
+
+MARKDOWN_EXTENSIONS = ['fenced_code', 'tables', 'sane_lists', 'toc']
+
+# 阅读速度：中文按字计，英文按单词计
+CJK_CHARS_PER_MINUTE = 400
+WORDS_PER_MINUTE = 250
+
+EXCERPT_LENGTH = 150
+
+BACKFILL_CHUNK_SIZE = 200  # 补齐渲染结果时每个事务处理的文章数
+
+_CJK_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+_WORD_RE = re.compile(r'[A-Za-z0-9]+(?:[\'-][A-Za-z0-9]+)*')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def render_markdown(content):
+    """把Markdown正文渲染为净化后的HTML，并计算目录、字数、阅读时间和摘要
+
+    返回字典：content_html、toc（JSON字符串）、word_count、read_time、excerpt
+    """
+    md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    html = md.convert(content or '')
+    content_html = bleach.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True
+    )
+
+    plain_text = _SPACE_RE.sub(' ', unescape(bleach.clean(html, tags=set(), strip=True))).strip()
+    cjk_chars = len(_CJK_RE.findall(plain_text))
+    words = len(_WORD_RE.findall(plain_text))
+    minutes = cjk_chars / CJK_CHARS_PER_MINUTE + words / WORDS_PER_MINUTE
+
+    excerpt = plain_text[:EXCERPT_LENGTH]
+    if len(plain_text) > EXCERPT_LENGTH:
+        excerpt += '...'
+
+    return {
+        'content_html': content_html,
+        'toc': json.dumps(_toc_entries(md.toc_tokens), ensure_ascii=False),
+        'word_count': cjk_chars + words,
+        'read_time': max(1, math.ceil(minutes)),
+        'excerpt': excerpt,
+    }
+
+
+def apply_rendered(article, rendered):
+    """把渲染结果写入文章（不覆盖read_time和excerpt，由调用方决定）"""
+    article.content_html = rendered['content_html']
+    article.toc = rendered['toc']
+    article.word_count = rendered['word_count']
+
+
+def store_rendered(article_id, rendered):
+    """补齐已有文章的渲染结果
+
+    正文没有变化，用UPDATE语句直接写入并保持updated_at不变（不触发onupdate），
+    文章的ETag和Last-Modified不会因此改变。
+    """
+    db.session.execute(
+        Article.__table__.update()
+        .where(Article.__table__.c.id == article_id)
+        .values(
+            content_html=rendered['content_html'],
+            toc=rendered['toc'],
+            word_count=rendered['word_count'],
+            updated_at=Article.__table__.c.updated_at,
+        )
+    )
+
+
+def backfill_rendered(chunk_size=BACKFILL_CHUNK_SIZE):
+    """为还没有渲染结果的文章（迁移前创建的）补齐content_html、toc和word_count，返回补齐的篇数"""
+    backfilled = 0
+    last_id = 0
+    while True:
+        rows = db.session.query(Article.id, Article.content) \
+            .filter(Article.content_html.is_(None), Article.id > last_id) \
+            .order_by(Article.id) \
+            .limit(chunk_size) \
+            .all()
+        if not rows:
+            break
+        for article_id, content in rows:
+            store_rendered(article_id, render_markdown(content))
+        db.session.commit()
+        backfilled += len(rows)
+        last_id = rows[-1].id
+    return backfilled
+
+
+def _toc_entries(tokens):
+    return [
+        {
+            'level': token['level'],
+            'id': token['id'],
+            'title': token['name'],
+            'children': _toc_entries(token['children'])
+        }
+        for token in tokens
+    ]
@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request
+from utils.http_cache import body_etag, is_not_modified, not_modified_response, set_validators
+
+# 缓存分组：读接口声明依赖哪些数据，写接口声明修改了哪些数据
+ARTICLES = 'articles'
+TAGS = 'tags'
+COMMENTS = 'comments'
+PROJECTS = 'projects'
+
+
+class ResponseCache:
+    """GET接口的进程内响应缓存（LRU + TTL），由写接口按数据分组精确失效
+
+    每条缓存在写入时计算一次响应体的ETag，命中时可以直接用304响应条件请求。
+    每个进程各自缓存，其他进程的写入只能等TTL过期后生效。
+    """
+
+    def __init__(self, max_entries=512, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (过期时间, 分组, body, status, mimetype, etag)
+        self._generations = {}  # 分组 -> 失效次数，用于丢弃失效前开始计算的响应
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', self.max_entries)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', self.ttl)
+        self.enabled = app.config.get('RESPONSE_CACHE_ENABLED', self.enabled)
+        app.extensions['response_cache'] = self
+
+    def cached(self, *groups):
+        """缓存GET接口的成功响应，groups为该接口依赖的数据分组"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or request.method != 'GET':
+                    return view(*args, **kwargs)
+
+                key = self._make_key()
+                entry = self._get(key)
+                if entry is not None:
+                    _, _, body, status, mimetype, etag = entry
+                    if is_not_modified(etag):
+                        response = not_modified_response(etag)
+                    else:
+                        response = current_app.response_class(body, status=status, mimetype=mimetype)
+                        set_validators(response, etag)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                generations = self._snapshot(groups)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    etag = self._set(key, groups, generations, response)
+                    if is_not_modified(etag):
+                        response = not_modified_response(etag)
+                    else:
+                        set_validators(response, etag)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def invalidates(self, *groups):
+        """写接口成功后使依赖这些分组的缓存失效"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                response = make_response(view(*args, **kwargs))
+                if response.status_code < 400:
+                    self.invalidate(*groups)
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *groups):
+        groups = set(groups)
+        with self._lock:
+            for group in groups:
+                self._generations[group] = self._generations.get(group, 0) + 1
+            stale = [key for key, entry in self._entries.items() if groups & entry[1]]
+            for key in stale:
+                del self._entries[key]
+            self._stats['invalidations'] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['ttl'] = self.ttl
+        return stats
+
+    def _make_key(self):
+        # 查询参数排序后作为键的一部分，参数顺序不同的请求共用同一条缓存
+        args = tuple(sorted(request.args.items(multi=True)))
+        return request.endpoint, request.path, args
+
+    def _snapshot(self, groups):
+        with self._lock:
+            return tuple(self._generations.get(group, 0) for group in groups)
+
+    def _get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry
+
+    def _set(self, key, groups, generations, response):
+        """写入缓存并返回响应体的ETag"""
+        body = response.get_data()
+        etag = body_etag(body)
+        with self._lock:
+            # 计算响应期间发生过失效，结果可能已经过时，不写入缓存
+            if generations != tuple(self._generations.get(group, 0) for group in groups):
+                return etag
+            self._entries[key] = (
+                time.monotonic() + self.ttl, frozenset(groups), body,
+                response.status_code, response.mimetype, etag
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return etag
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,305 @@
+import bisect
+import heapq
+import itertools
+import logging
+import math
+import re
+import threading
+
+from sqlalchemy import or_
+
+from models import db, Article, ArticleTag, Tag
+
+logger = logging.getLogger(__name__)
+
+# 各字段在BM25F打分中的权重
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'tags': 2.5,
+    'excerpt': 1.5,
+    'content': 1.0,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+BUILD_CHUNK_SIZE = 500  # 构建索引时每次读取的文章数
+
+# 连续的中日韩文字，或英文/数字单词（保留c++、c#这类后缀）
+_TOKEN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[a-z0-9]+[+#]*')
+_CJK_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+
+
+def tokenize(text, for_query=False):
+    """分词：英文按单词切分，中文按二元组（bigram）切分
+
+    建索引时额外保留中文单字，使单字查询也能命中；查询时多字中文只使用二元组。
+    """
+    tokens = []
+    if not text:
+        return tokens
+
+    for run in _TOKEN_RE.findall(text.lower()):
+        if not _CJK_RE.match(run):
+            tokens.append(run)
+            continue
+
+        if len(run) == 1:
+            tokens.append(run)
+            continue
+
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        if not for_query:
+            tokens.extend(run)
+
+    return tokens
+
+
+class SearchIndex:
+    """文章全文检索的内存倒排索引（BM25F排序）
+
+    首次搜索时在后台线程中从数据库构建，构建期间的搜索退回到标题、标签的模糊匹配；
+    构建完成后整体替换，之后只由文章的创建、更新、删除增量维护，不再定时重建。
+    构建期间发生的增量变更先记录下来，替换索引后重放。
+    英文查询词同时匹配以它为前缀的词（如pyth匹配python）。
+    """
+
+    def __init__(self, prefix_limit=50):
+        self.prefix_limit = prefix_limit  # 每个查询词最多展开的前缀匹配词数
+        self._app = None
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._building = False
+        self._pending = {}  # 构建期间的增量变更：article_id -> 索引参数，None表示移除
+        self._postings = {}  # term -> {article_id: 加权词频}
+        self._doc_terms = {}  # article_id -> 文档包含的词集合
+        self._doc_len = {}  # article_id -> 加权文档长度
+        self._total_len = 0.0
+        self._sorted_terms = None  # 前缀匹配用的有序词表，构建完成后随增删词增量维护
+
+    def init_app(self, app):
+        self._app = app
+        self.prefix_limit = app.config.get('SEARCH_PREFIX_LIMIT', self.prefix_limit)
+        app.extensions['search_index'] = self
+
+    def search(self, query, offset=0, limit=10):
+        """返回 (当前页的文章ID列表, 命中总数)，结果按相关度降序排列"""
+        terms = list(dict.fromkeys(tokenize(query, for_query=True)))
+        if not terms:
+            return [], 0
+
+        with self._lock:
+            loaded = self._loaded
+            if loaded:
+                scored = self._score(terms)
+            else:
+                self._start_build()
+
+        if not loaded:
+            return _fallback_search(query, offset, limit)
+
+        # 只对需要的前offset+limit条做部分排序；同分时新文章（ID大）优先
+        top = heapq.nlargest(offset + limit, scored)
+        return [article_id for _, article_id in top[offset:offset + limit]], len(scored)
+
+    def _score(self, terms):
+        postings = []
+        for term in terms:
+            docs = self._term_postings(term)
+            if not docs:
+                # 所有查询词都必须命中
+                return []
+            postings.append(docs)
+
+        # 从最短的倒排表开始求交集
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for docs in postings[1:]:
+            candidates.intersection_update(docs)
+            if not candidates:
+                return []
+
+        doc_count = len(self._doc_len)
+        avg_len = self._total_len / doc_count if doc_count else 1.0
+        idfs = [math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5)) for docs in postings]
+
+        scored = []
+        for article_id in candidates:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_len[article_id] / avg_len)
+            score = 0.0
+            for idf, docs in zip(idfs, postings):
+                tf = docs[article_id]
+                score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            scored.append((score, article_id))
+        return scored
+
+    def _term_postings(self, term):
+        """查询词的倒排表；英文词合并以它为前缀的词，同一文章取最大词频"""
+        docs = self._postings.get(term)
+        if len(term) < 2 or _CJK_RE.match(term):
+            return docs
+
+        start = bisect.bisect_left(self._sorted_terms, term)
+        expanded = []
+        for candidate in itertools.islice(self._sorted_terms, start, start + self.prefix_limit + 1):
+            if not candidate.startswith(term):
+                break
+            if candidate != term:
+                expanded.append(self._postings[candidate])
+        if not expanded:
+            return docs
+
+        merged = dict(docs) if docs else {}
+        for candidate_docs in expanded:
+            for article_id, tf in candidate_docs.items():
+                if tf > merged.get(article_id, 0.0):
+                    merged[article_id] = tf
+        return merged
+
+    def index_article(self, article_id, title, excerpt, content, tags):
+        """新增或更新一篇已发布文章的索引"""
+        with self._lock:
+            if self._building:
+                self._pending[article_id] = (title, excerpt, content, list(tags))
+            if not self._loaded:
+                # 索引尚未构建完成，构建结束后重放构建期间的变更
+                return
+            self._remove(article_id)
+            self._add(article_id, title, excerpt, content, tags)
+
+    def remove_article(self, article_id):
+        """从索引中移除文章（删除或取消发布时调用）"""
+        with self._lock:
+            if self._building:
+                self._pending[article_id] = None
+            if self._loaded:
+                self._remove(article_id)
+
+    def _start_build(self):
+        if self._building or self._app is None:
+            return
+        self._building = True
+        self._pending = {}
+        threading.Thread(target=self._build_in_background, name='search-index-build', daemon=True).start()
+
+    def _build_in_background(self):
+        try:
+            with self._app.app_context():
+                self.rebuild()
+        except Exception:
+            logger.exception('构建全文检索索引失败，下一次搜索时重试')
+            with self._lock:
+                self._building = False
+
+    def rebuild(self):
+        """从数据库构建新索引，完成后替换当前索引
+
+        读取和分词不持有锁，不阻塞搜索和增量更新；在后台线程的应用上下文中调用。
+        """
+        with self._lock:
+            if not self._building:
+                self._building = True
+                self._pending = {}
+
+        built = SearchIndex(self.prefix_limit)  # 构建期间不维护有序词表，读完后一次排序
+
+        tag_rows = db.session.query(ArticleTag.article_id, Tag.name) \
+            .join(Tag) \
+            .join(Article, Article.id == ArticleTag.article_id) \
+            .filter(Article.is_published.is_(True)) \
+            .all()
+        article_tags = {}
+        for article_id, tag_name in tag_rows:
+            article_tags.setdefault(article_id, []).append(tag_name)
+
+        # 按ID分块读取文章，每块一个短事务，不长时间占用连接或阻塞写入
+        last_id = 0
+        while True:
+            rows = db.session.query(Article.id, Article.title, Article.excerpt, Article.content) \
+                .filter(Article.is_published.is_(True), Article.id > last_id) \
+                .order_by(Article.id) \
+                .limit(BUILD_CHUNK_SIZE) \
+                .all()
+            db.session.rollback()
+            if not rows:
+                break
+            for article_id, title, excerpt, content in rows:
+                built._add(article_id, title, excerpt, content, article_tags.get(article_id, []))
+            last_id = rows[-1].id
+        sorted_terms = sorted(built._postings)
+
+        with self._lock:
+            self._postings = built._postings
+            self._doc_terms = built._doc_terms
+            self._doc_len = built._doc_len
+            self._total_len = built._total_len
+            self._sorted_terms = sorted_terms
+
+            # 重放构建期间的变更（读取数据时不一定已经看到它们）
+            for article_id, document in self._pending.items():
+                self._remove(article_id)
+                if document is not None:
+                    self._add(article_id, *document)
+            self._pending = {}
+            self._building = False
+            self._loaded = True
+
+    def _add(self, article_id, title, excerpt, content, tags):
+        fields = {
+            'title': tokenize(title),
+            'tags': [token for tag in tags for token in tokenize(tag)],
+            'excerpt': tokenize(excerpt),
+            'content': tokenize(content),
+        }
+
+        weighted_tf = {}
+        doc_len = 0.0
+        for field, tokens in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            doc_len += weight * len(tokens)
+            for token in tokens:
+                weighted_tf[token] = weighted_tf.get(token, 0.0) + weight
+
+        for term, tf in weighted_tf.items():
+            docs = self._postings.get(term)
+            if docs is None:
+                docs = self._postings[term] = {}
+                if self._sorted_terms is not None:
+                    bisect.insort(self._sorted_terms, term)
+            docs[article_id] = tf
+        self._doc_terms[article_id] = set(weighted_tf)
+        self._doc_len[article_id] = doc_len
+        self._total_len += doc_len
+
+    def _remove(self, article_id):
+        terms = self._doc_terms.pop(article_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            docs = self._postings.get(term)
+            if docs is not None:
+                docs.pop(article_id, None)
+                if not docs:
+                    del self._postings[term]
+                    if self._sorted_terms is not None:
+                        del self._sorted_terms[bisect.bisect_left(self._sorted_terms, term)]
+        self._total_len -= self._doc_len.pop(article_id, 0.0)
+
+
+def _fallback_search(query, offset, limit):
+    """索引构建完成前按标题或标签模糊匹配，按发布时间倒序"""
+    pattern = f'%{query}%'
+    tag_match = db.session.query(ArticleTag.id) \
+        .join(Tag) \
+        .filter(ArticleTag.article_id == Article.id, Tag.name.ilike(pattern)) \
+        .exists()
+    matches = db.session.query(Article.id) \
+        .filter(Article.is_published.is_(True), or_(Article.title.ilike(pattern), tag_match))
+    total = matches.count()
+    article_ids = [article_id for (article_id,) in matches
+                   .order_by(Article.created_at.desc(), Article.id.desc())
+                   .offset(offset).limit(limit)]
+    return article_ids, total
+
+
+search_index = SearchIndex()
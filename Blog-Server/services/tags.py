@@ -0,0 +1,142 @@
+from collections import defaultdict
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from models import db, Article, Tag, ArticleTag
+
+_tag_table = Tag.__table__
+_article_tag_table = ArticleTag.__table__
+
+
+def normalize_names(names):
+    """去掉首尾空白和空标签，按首次出现的顺序去重"""
+    result = []
+    seen = set()
+    for name in names or []:
+        name = str(name).strip()
+        if name and name not in seen:
+            seen.add(name)
+            result.append(name)
+    return result
+
+
+def resolve_tags(names):
+    """把标签名解析为 {标签名: 标签ID}
+
+    一次IN查询取出已有标签，缺失的标签用一条批量INSERT创建；
+    与并发请求同时创建同名标签时，回退为逐个插入并忽略唯一约束冲突。
+    """
+    names = normalize_names(names)
+    if not names:
+        return {}
+
+    found = _match(names, db.session.query(Tag.name, Tag.id).filter(Tag.name.in_(names)).all())
+    missing = [name for name in names if name not in found]
+    if not missing:
+        return found
+
+    try:
+        with db.session.begin_nested():
+            db.session.execute(_tag_table.insert(), [{'name': name} for name in missing])
+    except IntegrityError:
+        for name in missing:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(_tag_table.insert().values(name=name))
+            except IntegrityError:
+                pass  # 已被其他请求创建
+
+    found.update(_match(missing, db.session.query(Tag.name, Tag.id).filter(Tag.name.in_(missing)).all()))
+    return found
+
+
+def set_article_tags(article_id, names, is_new=False, published=True):
+    """把文章的标签设置为names：只删除移除的关联、只插入新增的关联，并同步标签的文章数
+
+    返回 (标签名列表, 关联是否发生变化)。is_new=True表示新文章，跳过读取现有关联；
+    published为文章当前是否已发布。
+    """
+    tags = resolve_tags(names)
+    wanted = set(tags.values())
+
+    current = set()
+    if not is_new:
+        current = {tag_id for (tag_id,) in db.session.query(ArticleTag.tag_id)
+                   .filter(ArticleTag.article_id == article_id).all()}
+
+    removed = current - wanted
+    added = wanted - current
+
+    if removed:
+        db.session.execute(_article_tag_table.delete().where(
+            _article_tag_table.c.article_id == article_id,
+            _article_tag_table.c.tag_id.in_(removed)
+        ))
+    if added:
+        db.session.execute(_article_tag_table.insert(), [
+            {'article_id': article_id, 'tag_id': tag_id} for tag_id in added
+        ])
+
+    deltas = dict.fromkeys(added, 1)
+    deltas.update(dict.fromkeys(removed, -1))
+    adjust_counts(deltas, published)
+
+    return list(tags), bool(removed or added)
+
+
+def adjust_counts(deltas, published):
+    """按 {标签ID: 增减的文章数} 更新标签的文章数，与关联写入处于同一事务
+
+    published为这些文章是否已发布，已发布时同时更新published_count。增减量相同的标签合并为一条UPDATE。
+    """
+    by_delta = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(tag_id)
+
+    for delta, tag_ids in by_delta.items():
+        values = {'article_count': _tag_table.c.article_count + delta}
+        if published:
+            values['published_count'] = _tag_table.c.published_count + delta
+        db.session.execute(_tag_table.update().where(_tag_table.c.id.in_(tag_ids)).values(**values))
+
+
+def adjust_published(article_id, delta):
+    """文章发布（delta=1）或取消发布（delta=-1）时更新其标签的已发布文章数"""
+    tag_ids = select(_article_tag_table.c.tag_id).where(_article_tag_table.c.article_id == article_id)
+    db.session.execute(_tag_table.update().where(_tag_table.c.id.in_(tag_ids))
+                       .values(published_count=_tag_table.c.published_count + delta))
+
+
+def remove_article_tags(article_id, published):
+    """删除文章的全部标签关联并更新标签的文章数（删除文章时调用）"""
+    tag_ids = [tag_id for (tag_id,) in db.session.query(ArticleTag.tag_id)
+               .filter(ArticleTag.article_id == article_id).all()]
+    if not tag_ids:
+        return
+    db.session.execute(_article_tag_table.delete().where(_article_tag_table.c.article_id == article_id))
+    adjust_counts(dict.fromkeys(tag_ids, -1), published)
+
+
+def rebuild_counts():
+    """根据关联表重新计算所有标签的文章数（调用方负责提交事务）"""
+    linked = select(func.count()).select_from(_article_tag_table) \
+        .where(_article_tag_table.c.tag_id == _tag_table.c.id) \
+        .scalar_subquery()
+    published = select(func.count()).select_from(_article_tag_table) \
+        .join(Article.__table__, Article.__table__.c.id == _article_tag_table.c.article_id) \
+        .where(_article_tag_table.c.tag_id == _tag_table.c.id, Article.__table__.c.is_published.is_(True)) \
+        .scalar_subquery()
+    db.session.execute(_tag_table.update().values(article_count=linked, published_count=published))
+
+
+def _match(names, rows):
+    # MySQL默认排序规则不区分大小写，查询结果的名称可能与请求的大小写不同
+    exact = dict(rows)
+    folded = {name.casefold(): tag_id for name, tag_id in rows}
+    result = {}
+    for name in names:
+        tag_id = exact.get(name, folded.get(name.casefold()))
+        if tag_id is not None:
+            result[name] = tag_id
+    return result
@@ -0,0 +1,180 @@
+import heapq
+import logging
+import math
+import threading
+import time
+from datetime import datetime
+
+from models import db, Article
+
+logger = logging.getLogger(__name__)
+
+RETRY_INTERVAL = 60  # 首次计算失败后的重试间隔，单位：秒
+
+# 各类互动事件的权重
+EVENT_WEIGHTS = {
+    'view': 1.0,
+    'like': 3.0,
+    'comment': 5.0,
+}
+
+
+class TrendingRanker:
+    """按时间衰减热度维护的热门文章Top-K
+
+    使用前向衰减：事件分值按 w * e^((t - landmark) / tau) 累加，各文章分值之间的大小关系
+    不随时间推移而改变，因此只有发生事件的文章需要调整位置。启动时以及之后每隔
+    rebuild_interval秒，在后台线程中从数据库重新计算基础分并重置landmark，防止指数溢出；
+    读取排行只访问内存。
+    """
+
+    def __init__(self, half_life_hours=24, top_k=50, rebuild_interval=3600):
+        self.top_k = top_k
+        self.rebuild_interval = rebuild_interval
+        self._tau = half_life_hours * 3600 / math.log(2)
+        self._app = None
+        self._timer = None
+        self._lock = threading.Lock()
+        self._landmark = time.time()
+        self._built = False
+        self._ready = threading.Event()  # 首次计算完成后置位
+        self._building = False
+        self._scores = {}  # article_id -> 以landmark为基准的分值
+        self._events = {}  # article_id -> 重新计算期间记录的事件分值（以landmark为基准）
+        self._removed = set()  # 重新计算期间移除的文章
+        self._top = []  # [(分值, article_id)]，按分值降序
+
+    def init_app(self, app):
+        """绑定应用，立即在后台计算一次排行，之后定时重新计算"""
+        self._app = app
+        self.top_k = app.config.get('TRENDING_TOP_K', self.top_k)
+        self.rebuild_interval = app.config.get('TRENDING_REBUILD_INTERVAL', self.rebuild_interval)
+        self._tau = app.config.get('TRENDING_HALF_LIFE_HOURS', 24) * 3600 / math.log(2)
+        app.extensions['trending'] = self
+        self._schedule(0)
+
+    def record(self, article_id, event):
+        """记录一次浏览、点赞或评论事件"""
+        with self._lock:
+            weight = EVENT_WEIGHTS[event] * math.exp((time.time() - self._landmark) / self._tau)
+            if self._building:
+                # 重新计算读到的互动数不一定包含这次事件，替换排行时叠加
+                self._events[article_id] = self._events.get(article_id, 0.0) + weight
+            if not self._built:
+                return
+            score = self._scores.get(article_id, 0.0) + weight
+            self._scores[article_id] = score
+            self._promote(article_id, score)
+
+    def remove(self, article_id):
+        """文章被删除或取消发布时移出排行"""
+        with self._lock:
+            self._scores.pop(article_id, None)
+            self._events.pop(article_id, None)
+            if self._building:
+                self._removed.add(article_id)
+            if any(top_id == article_id for _, top_id in self._top):
+                self._top = heapq.nlargest(self.top_k, ((s, i) for i, s in self._scores.items()))
+
+    def top(self, limit):
+        """返回热度最高的limit篇文章ID；启动后首次计算完成前返回None"""
+        with self._lock:
+            if not self._built:
+                return None
+            return [article_id for _, article_id in self._top[:limit]]
+
+    def _promote(self, article_id, score):
+        for index, (_, top_id) in enumerate(self._top):
+            if top_id == article_id:
+                del self._top[index]
+                break
+        else:
+            if len(self._top) >= self.top_k and score <= self._top[-1][0]:
+                return
+
+        # Top-K规模很小，线性插入即可
+        position = len(self._top)
+        for index, (top_score, _) in enumerate(self._top):
+            if score > top_score:
+                position = index
+                break
+        self._top.insert(position, (score, article_id))
+        del self._top[self.top_k:]
+
+    def wait_until_built(self, timeout=None):
+        """等待启动后的首次计算完成，超时返回False（基准测试等需要稳定状态的场景使用）"""
+        return self._ready.wait(timeout)
+
+    def rebuild(self):
+        """从数据库重新计算基础分并重置landmark（在后台线程的应用上下文中调用）
+
+        读取和计算不持有锁，不阻塞事件记录和读取排行，完成后整体替换。数据库中的累计互动数
+        已经包含此前记录的事件（浏览量落库后），因此只叠加计算期间记录的事件，不重复计算。
+        """
+        with self._lock:
+            self._building = True
+            self._events = {}
+            self._removed = set()
+
+        try:
+            now = time.time()
+            utc_now = datetime.utcnow()
+            rows = db.session.query(
+                Article.id,
+                Article.view_count,
+                Article.like_count,
+                Article.comment_count,
+                Article.created_at
+            ).filter(Article.is_published.is_(True)).all()
+
+            # 基础分：累计互动数按文章发布时间衰减，即以now为landmark的分值
+            scores = {}
+            for article_id, views, likes, comments, created_at in rows:
+                base = (views or 0) * EVENT_WEIGHTS['view'] \
+                    + (likes or 0) * EVENT_WEIGHTS['like'] \
+                    + (comments or 0) * EVENT_WEIGHTS['comment']
+                age = (utc_now - created_at).total_seconds() if created_at else 0
+                scores[article_id] = base * math.exp(-max(age, 0) / self._tau)
+            top = heapq.nlargest(self.top_k, ((s, i) for i, s in scores.items()))
+        except Exception:
+            with self._lock:
+                self._building = False
+                self._events = {}
+            raise
+
+        with self._lock:
+            # 计算期间的事件以旧landmark为基准，换算到新landmark后叠加
+            rescale = math.exp((self._landmark - now) / self._tau)
+            for article_id, score in self._events.items():
+                scores[article_id] = scores.get(article_id, 0.0) + score * rescale
+            for article_id in self._removed:
+                scores.pop(article_id, None)
+            if self._events or self._removed:
+                top = heapq.nlargest(self.top_k, ((s, i) for i, s in scores.items()))
+
+            self._landmark = now
+            self._scores = scores
+            self._top = top
+            self._events = {}
+            self._removed = set()
+            self._building = False
+            self._built = True
+        self._ready.set()
+
+    def _schedule(self, delay):
+        self._timer = threading.Timer(delay, self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _run(self):
+        try:
+            with self._app.app_context():
+                self.rebuild()
+        except Exception:
+            logger.exception('重新计算热门文章排行失败，稍后重试')
+        finally:
+            # 首次计算成功前（例如启动时数据表尚未创建）按较短的间隔重试
+            self._schedule(self.rebuild_interval if self._built else min(self.rebuild_interval, RETRY_INTERVAL))
+
+
+trending = TrendingRanker()
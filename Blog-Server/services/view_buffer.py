@@ -0,0 +1,107 @@
+import atexit
+import logging
+import threading
+
+from models import db
+from services import counters
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """文章浏览量写缓冲：在进程内按文章聚合增量，定时或达到阈值时批量落库"""
+
+    def __init__(self, flush_interval=5.0, max_pending=500):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._app = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}  # article_id -> 尚未落库的浏览量增量
+        self._pending_total = 0
+        self._known = {}  # article_id -> 最近一次从数据库读到的浏览量
+        self._timer = None
+
+    def init_app(self, app):
+        """绑定应用，启动定时落库并在进程退出时落库"""
+        self._app = app
+        self.flush_interval = app.config.get('VIEW_BUFFER_FLUSH_INTERVAL', self.flush_interval)
+        self.max_pending = app.config.get('VIEW_BUFFER_MAX_PENDING', self.max_pending)
+        app.extensions['view_buffer'] = self
+
+        atexit.register(self.flush)
+        self._schedule()
+
+    def increment(self, article_id, delta=1):
+        """记录浏览量增量，返回近似的当前浏览量；文章不存在时返回None"""
+        with self._lock:
+            known = self._known.get(article_id)
+
+        if known is None:
+            # 只读取浏览量一列，不加载整行文章
+            known = counters.get(article_id, 'view_count')
+            if known is None:
+                return None
+
+        with self._lock:
+            known = self._known.setdefault(article_id, known)
+            pending = self._pending.get(article_id, 0) + delta
+            self._pending[article_id] = pending
+            self._pending_total += delta
+            should_flush = self._pending_total >= self.max_pending
+
+        if should_flush:
+            self.flush()
+
+        return known + pending
+
+    def pending(self, article_id):
+        """返回文章尚未落库的浏览量增量"""
+        with self._lock:
+            return self._pending.get(article_id, 0)
+
+    def flush(self):
+        """将缓冲的增量合并成一条UPDATE语句写入数据库，返回写入的文章数"""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {}
+                self._pending_total = 0
+
+            if not pending or self._app is None:
+                return 0
+
+            with self._app.app_context():
+                try:
+                    counters.bulk_increment('view_count', pending)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    logger.exception('浏览量批量落库失败，增量将在下次重试')
+                    # 写库失败时把增量放回缓冲，避免丢失
+                    with self._lock:
+                        for article_id, delta in pending.items():
+                            self._pending[article_id] = self._pending.get(article_id, 0) + delta
+                            self._pending_total += delta
+                    return 0
+
+            # 落库后丢弃已知浏览量，下次访问时重新读取数据库中的最新值
+            with self._lock:
+                for article_id in pending:
+                    self._known.pop(article_id, None)
+
+            return len(pending)
+
+    def _schedule(self):
+        self._timer = threading.Timer(self.flush_interval, self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _run(self):
+        try:
+            self.flush()
+        finally:
+            self._schedule()
+
+
+view_buffer = ViewCountBuffer()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+数据库结构迁移脚本
+把models.py中声明的新表、新列、索引和唯一约束应用到已有数据库（MySQL/SQLite）
+
+使用方法（在Blog-Server目录下运行）：
+    python utils/db_migrate.py            # 执行迁移
+    python utils/db_migrate.py --dry-run  # 只打印将要执行的SQL
+"""
+
+import argparse
+import os
+import sys
+
+# 添加项目根目录到Python路径
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from flask import Flask
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from config import Config
+from models import db, ArticleArchive
+from services import archive as archive_service
+from services.render import backfill_rendered
+from services.tags import rebuild_counts
+
+# 不导入app.py：它在导入时执行db.create_all()，--dry-run时不能修改数据库
+app = Flask(__name__)
+app.config.from_object(Config)
+db.init_app(app)
+
+# 需要保证(左列, 右列)唯一的关联表
+ASSOCIATION_TABLES = {
+    'article_tags': ('article_id', 'tag_id'),
+    'project_articles': ('project_id', 'article_id'),
+}
+
+
+def add_missing_columns(conn, inspector, dry_run):
+    """为已有表补充模型中新增的列（新增列一律允许为空）"""
+    statements = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            statements.append(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type} NULL')
+
+    for statement in statements:
+        print(f'  {statement}')
+        if not dry_run:
+            conn.execute(text(statement))
+    return len(statements)
+
+
+def remove_duplicate_associations(conn, inspector, dry_run):
+    """删除关联表中的重复行（保留ID最小的一行），为唯一索引做准备"""
+    removed = 0
+    for table_name, (left, right) in ASSOCIATION_TABLES.items():
+        if not inspector.has_table(table_name):
+            continue
+        # MySQL不允许在子查询中直接引用被删除的表，需要再包一层派生表
+        statement = (
+            f'DELETE FROM {table_name} WHERE id NOT IN ('
+            f'SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM {table_name} '
+            f'GROUP BY {left}, {right}) AS keep_rows)'
+        )
+        print(f'  {statement}')
+        if not dry_run:
+            removed += conn.execute(text(statement)).rowcount
+    return removed
+
+
+def create_missing_indexes(conn, inspector, dry_run):
+    """创建模型中声明但数据库中尚不存在的索引"""
+    created = 0
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            print(f'  {CreateIndex(index).compile(dialect=conn.dialect)}')
+            if not dry_run:
+                index.create(bind=conn)
+            created += 1
+    return created
+
+
+def create_missing_tables(conn, inspector, dry_run):
+    """创建模型中新增、数据库中尚不存在的表"""
+    missing = [table for table in db.metadata.sorted_tables if not inspector.has_table(table.name)]
+    for table in missing:
+        print(f'  {str(CreateTable(table).compile(dialect=conn.dialect)).strip()}')
+    if missing and not dry_run:
+        db.metadata.create_all(bind=conn, tables=missing)
+    return [table.name for table in missing]
+
+
+def migrate(dry_run=False):
+    with app.app_context():
+        with db.engine.begin() as conn:
+            inspector = inspect(conn)
+
+            print('0. 创建新增的表...')
+            created = create_missing_tables(conn, inspector, dry_run)
+            print(f'   共 {len(created)} 张表')
+
+            print('1. 补充新增列...')
+            columns = add_missing_columns(conn, inspector, dry_run)
+            print(f'   共 {columns} 列')
+
+            print('2. 清理重复的关联记录...')
+            removed = remove_duplicate_associations(conn, inspector, dry_run)
+            print(f'   删除了 {removed} 行')
+
+            print('3. 创建索引和唯一约束...')
+            indexes = create_missing_indexes(conn, inspector, dry_run)
+            print(f'   共 {indexes} 个索引')
+
+        # 汇总表新建或为空时从文章表计算全部月份
+        print('4. 构建月度归档汇总...')
+        if ArticleArchive.__tablename__ not in created and archive_service.is_built():
+            print('   已有数据，跳过')
+        elif dry_run:
+            print('   将从文章表重新计算 article_archives')
+        else:
+            archive_service.rebuild()
+            db.session.commit()
+            months = db.session.query(ArticleArchive).count()
+            print(f'   共 {months} 个月份')
+
+        # 计数列新增时为空，每次迁移都从关联表重新计算（标签数量不多，开销很小）
+        print('5. 统计标签的文章数...')
+        if dry_run:
+            print('   将从关联表重新计算 tags.article_count、tags.published_count')
+        else:
+            rebuild_counts()
+            db.session.commit()
+            print('   完成')
+
+        # 新增content_html列之前创建的文章，在这里渲染，不留给首次读取时补齐
+        print('6. 补齐文章的渲染结果...')
+        if dry_run:
+            print('   将渲染 content_html 为空的文章')
+        else:
+            print(f'   共 {backfill_rendered()} 篇')
+
+    print('迁移完成' if not dry_run else '预览完成，未修改数据库')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='把模型中的表结构变更应用到已有数据库')
+    parser.add_argument('--dry-run', action='store_true', help='只打印SQL，不执行')
+    args = parser.parse_args()
+
+    migrate(dry_run=args.dry_run)
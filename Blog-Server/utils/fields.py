@@ -0,0 +1,55 @@
+
+# 文章列表接口可返回的字段（也是未传fields时的默认输出顺序）
+ARTICLE_LIST_FIELDS = (
+    'id', 'title', 'excerpt', 'read_time', 'view_count', 'like_count',
+    'comment_count', 'created_at', 'tags', 'program_name',
+)
+
+# 文章详情接口额外可返回的字段
+ARTICLE_DETAIL_FIELDS = ARTICLE_LIST_FIELDS + ('word_count', 'content', 'content_html', 'toc')
+
+# 项目接口可返回的字段
+PROJECT_FIELDS = (
+    'id', 'name', 'description', 'image_url', 'image_variants', 'created_at', 'updated_at', 'article_count',
+    'articles',
+)
+
+# 项目列表中每个项目附带的文章字段
+PROJECT_LIST_ARTICLE_FIELDS = ('id', 'title', 'created_at')
+
+# 项目详情中每篇文章可返回的字段（content默认不返回）
+PROJECT_ARTICLE_FIELDS = (
+    'id', 'title', 'excerpt', 'read_time', 'view_count', 'like_count',
+    'comment_count', 'created_at', 'tags', 'content',
+)
+
+
+def parse_fields(raw, allowed, default=None):
+    """解析fields参数（逗号分隔的字段名），返回按allowed顺序排列的字段元组
+
+    未传或为空时返回default（默认为allowed全部字段）；包含不支持的字段时抛出ValueError。
+    """
+    if raw is None or not raw.strip():
+        return tuple(default if default is not None else allowed)
+
+    requested = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"不支持的字段: {', '.join(sorted(unknown))}")
+    return tuple(name for name in allowed if name in requested)
+
+
+def columns_for(model, fields, *required):
+    """返回fields需要加载的model列，再加上查询本身需要的列（如排序、游标用的id和created_at）
+
+    不对应表中某一列的字段（如tags、article_count）由调用方单独查询，这里跳过。
+    """
+    columns = list(required)
+    loaded = {column.key for column in columns}
+    table_columns = model.__table__.columns
+    for name in fields:
+        if name in loaded or name not in table_columns:
+            continue
+        columns.append(getattr(model, name))
+        loaded.add(name)
+    return columns
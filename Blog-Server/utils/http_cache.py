@@ -0,0 +1,84 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+# services/compression.py压缩响应时附加到ETag上的后缀：Content-Encoding -> 后缀
+ETAG_SUFFIXES = {'br': '-br', 'gzip': '-gzip'}
+
+
+def make_etag(*parts):
+    """由资源的版本字段（ID、updated_at、计数等）计算强ETag"""
+    return hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def body_etag(body):
+    """由响应体计算强ETag（没有可用版本字段的列表接口使用）"""
+    return hashlib.md5(body).hexdigest()
+
+
+def conditional(view):
+    """为GET接口的成功响应按响应体设置ETag并处理If-None-Match
+
+    不依赖响应缓存：关闭RESPONSE_CACHE_ENABLED时仍然支持条件请求。放在response_cache.cached外层，
+    响应已经带ETag（由响应缓存或视图设置）或不是200时原样返回。
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        if request.method != 'GET' or response.status_code != 200 or response.is_streamed \
+                or response.get_etag()[0] is not None:
+            return response
+
+        etag = body_etag(response.get_data())
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        return set_validators(response, etag)
+    return wrapper
+
+
+def is_not_modified(etag=None, last_modified=None):
+    """根据If-None-Match / If-Modified-Since判断客户端缓存的版本是否仍然有效"""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+
+    # 同时携带两个条件时以If-None-Match为准
+    if etag is not None and request.if_none_match:
+        return etag_matches(etag)
+
+    if last_modified is not None and request.if_modified_since is not None:
+        # HTTP日期只精确到秒
+        if_modified_since = request.if_modified_since.replace(tzinfo=None)
+        return last_modified.replace(microsecond=0) <= if_modified_since
+
+    return False
+
+
+def etag_matches(etag):
+    """If-None-Match是否包含该ETag（忽略压缩中间件附加的编码后缀）"""
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    return any(_strip_encoding_suffix(tag) == etag for tag in if_none_match)
+
+
+def _strip_encoding_suffix(tag):
+    for suffix in ETAG_SUFFIXES.values():
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)]
+    return tag
+
+
+def not_modified_response(etag=None, last_modified=None):
+    """构造不带响应体的304响应"""
+    return set_validators(current_app.response_class(status=304), etag, last_modified)
+
+
+def set_validators(response, etag=None, last_modified=None):
+    """为响应设置ETag/Last-Modified，并要求客户端每次使用前重新验证"""
+    if etag is not None:
+        response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+文章批量导入脚本
+从Markdown目录（支持front-matter）或JSONL文件批量导入文章
+
+使用方法（在Blog-Server目录下运行）：
+    python utils/import_articles.py posts/                 # 导入目录下所有.md文件
+    python utils/import_articles.py articles.jsonl         # 导入JSONL文件，每行一篇文章
+    python utils/import_articles.py - < articles.jsonl     # 从标准输入读取JSONL
+"""
+
+import argparse
+import os
+import sys
+
+# 添加项目根目录到Python路径
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.insert(0, project_root)
+
+from app import app
+from services.importer import import_articles, iter_jsonl, iter_markdown_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量导入文章')
+    parser.add_argument('source', help='Markdown目录、JSONL文件，或 - 表示从标准输入读取JSONL')
+    parser.add_argument('--chunk-size', type=int, default=200, help='每个事务导入的文章数（默认200）')
+    args = parser.parse_args()
+
+    with app.app_context():
+        if args.source == '-':
+            report = import_articles(iter_jsonl(sys.stdin), chunk_size=args.chunk_size)
+        elif os.path.isdir(args.source):
+            report = import_articles(iter_markdown_dir(args.source), chunk_size=args.chunk_size)
+        else:
+            with open(args.source, encoding='utf-8') as f:
+                report = import_articles(iter_jsonl(f), chunk_size=args.chunk_size)
+
+    print(f"导入成功: {report['imported']} 篇")
+    print(f"导入失败: {report['failed']} 篇")
+    print(f"耗时: {report['elapsed_seconds']} 秒，{report['articles_per_second']} 篇/秒")
+    for error in report['errors']:
+        print(f"  [{error['index']}] {error['source'] or error['title']}: {error['error']}")
+    for warning in report['warnings']:
+        print(f"  警告 [{warning['index']}] {warning['source'] or warning['title']}: {warning['warning']}")
+
+    sys.exit(1 if report['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+可复现的大规模测试数据生成脚本
+按固定随机种子生成文章、标签、评论和项目，用Core批量插入，可生成百万级数据用于性能测试
+
+数据分布：
+- 浏览量服从帕累托（幂律）分布，少数文章占据大部分浏览
+- 点赞数与浏览量成比例，评论按浏览量加权分配到文章
+- 标签和项目的使用频率服从Zipf分布
+
+使用方法（在Blog-Server目录下运行）：
+    python utils/init_data/generate_data.py --articles 1000 --clear
+    python utils/init_data/generate_data.py --articles 1000000 --comments 3000000 --tags 2000 --projects 500
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta
+
+# 添加项目根目录到Python路径
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, "../.."))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import func
+
+from models import db, Article, ArticleArchive, ArticleTag, Comment, Project, ProjectArticle, Tag
+from services import archive as archive_service
+from services.render import render_markdown
+from services.tags import rebuild_counts, resolve_tags
+
+# 文章标题模板
+ARTICLE_TITLES = [
+    "Python编程入门指南", "Vue.js前端开发实战", "Flask后端API设计", "数据库优化技巧",
+    "Web安全最佳实践", "机器学习基础教程", "Docker容器化部署", "RESTful API设计原则",
+    "前端性能优化策略", "微服务架构设计", "React Hooks使用指南", "TypeScript类型系统详解",
+    "Git工作流最佳实践", "CI/CD流水线搭建", "云计算基础概念", "数据结构与算法",
+    "Linux系统管理", "网络安全防护", "移动应用开发", "人工智能应用场景",
+]
+
+# 文章内容模板
+ARTICLE_CONTENT = """## {title}
+
+这是一篇关于{title}的示例文章内容。
+
+### 章节一：概述
+{title}是现代软件开发中的重要组成部分。本文将详细介绍相关概念和实践。
+
+### 章节二：核心概念
+1. **基础概念**：理解{title}的基本原理
+2. **实践应用**：在实际项目中的应用场景
+3. **最佳实践**：行业内的最佳实践方法
+
+### 章节三：代码示例
+```python
+def example_function():
+    print("Hello, {title}!")
+    return True
+```
+
+### 章节四：总结
+通过本文的学习，您应该对{title}有了更深入的理解。建议结合实际项目进行练习。
+
+---
+
+*本文为模拟数据，仅用于测试目的。*
+"""
+
+# 常用标签，超出部分按序号命名
+TAG_NAMES = [
+    "Python", "Vue", "Flask", "数据库", "前端",
+    "后端", "DevOps", "机器学习", "安全", "工具",
+]
+
+PROJECT_NAMES = [
+    "探索未来科技趋势", "Web全栈开发实战", "数据科学与机器学习", "移动应用开发指南", "DevOps与云原生",
+]
+
+AUTHOR_NAMES = [
+    "张三", "李四", "王五", "赵六", "钱七",
+    "孙八", "周九", "吴十", "郑十一", "王十二",
+]
+
+COMMENT_TEMPLATES = [
+    "很好的文章，学到了很多！", "感谢分享，对我帮助很大。", "内容很详细，期待更多相关文章。",
+    "有几个地方不太明白，能详细解释一下吗？", "实践了一下，效果不错！", "文章结构清晰，易于理解。",
+    "希望能有更多实战案例。", "这个技术点讲得很透彻。", "对我当前的项目很有帮助。", "期待作者的下一篇文章。",
+]
+
+# 渲染正文时代替分部序号的占位数字：同一标题模板的文章只渲染一次，再替换为实际序号
+PART_PLACEHOLDER = "9876543210"
+
+# 默认的时间分布截止时刻（UTC）：固定值而不是当前时间，保证多次生成的数据一致
+DEFAULT_NOW = datetime(2025, 1, 1)
+
+# 删除顺序（先子表后父表）
+CLEAR_ORDER = [Comment, ArticleTag, ProjectArticle, ArticleArchive, Article, Tag, Project]
+
+
+def zipf_cum_weights(n, s=1.1):
+    """第k名的权重为 1 / k^s，返回累计权重供random.choices使用"""
+    return list(itertools.accumulate(1.0 / (k ** s) for k in range(1, n + 1)))
+
+
+def clear_data():
+    """清空所有业务数据"""
+    for model in CLEAR_ORDER:
+        db.session.execute(model.__table__.delete())
+    db.session.commit()
+
+
+def next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def article_title(index, part=None):
+    title = ARTICLE_TITLES[index % len(ARTICLE_TITLES)]
+    if index >= len(ARTICLE_TITLES):
+        title = f"{title}（第{index // len(ARTICLE_TITLES) + 1 if part is None else part}部分）"
+    return title
+
+
+def rendered_content(index, cache):
+    """文章正文的渲染结果（与写入接口一致）；逐篇渲染百万级文章太慢，按标题模板缓存"""
+    key = (index % len(ARTICLE_TITLES), index >= len(ARTICLE_TITLES))
+    if key not in cache:
+        cache[key] = render_markdown(ARTICLE_CONTENT.format(title=article_title(index, PART_PLACEHOLDER)))
+    rendered = cache[key]
+    if not key[1]:
+        return rendered
+    part = str(index // len(ARTICLE_TITLES) + 1)
+    return {
+        'content_html': rendered['content_html'].replace(PART_PLACEHOLDER, part),
+        'toc': rendered['toc'].replace(PART_PLACEHOLDER, part),
+        'word_count': rendered['word_count'],
+    }
+
+
+def generate(articles=1000, tags=50, comments=None, projects=10, seed=42, chunk_size=5000,
+             days=730, publish_ratio=0.95, project_ratio=0.1, now=None, clear=False, log=print):
+    """生成数据并返回各表的行数和耗时；需要在应用上下文中调用
+
+    now为时间分布的截止时刻，默认固定为DEFAULT_NOW，使相同参数生成的时间戳也完全相同
+    """
+    rng = random.Random(seed)
+    if comments is None:
+        comments = articles * 2
+    started = time.perf_counter()
+    counts = {'articles': 0, 'tags': 0, 'article_tags': 0, 'comments': 0, 'projects': 0, 'project_articles': 0}
+
+    if clear:
+        log("清空现有数据...")
+        clear_data()
+
+    # 1. 浏览量（幂律分布），并按浏览量加权把评论分配到文章
+    view_counts = array('I', (min(int(10 * rng.paretovariate(1.16)), 10_000_000) for _ in range(articles)))
+    comment_counts = array('I', bytes(4 * articles))
+    if articles and comments:
+        cum_views = list(itertools.accumulate(count + 1 for count in view_counts))
+        remaining = comments
+        while remaining:
+            batch = min(remaining, 100_000)
+            for index in rng.choices(range(articles), cum_weights=cum_views, k=batch):
+                comment_counts[index] += 1
+            remaining -= batch
+        del cum_views
+
+    # 2. 标签（已存在的同名标签直接复用）
+    tag_names = (TAG_NAMES + [f"标签{i}" for i in range(len(TAG_NAMES), tags)])[:tags]
+    tag_map = resolve_tags(tag_names)
+    db.session.commit()
+    tag_ids = [tag_map[name] for name in tag_names]
+    tag_cum_weights = zipf_cum_weights(len(tag_ids))
+    counts['tags'] = len(tag_ids)
+
+    # 3. 项目
+    now = now or DEFAULT_NOW
+    project_start = next_id(Project)
+    project_rows = []
+    for i in range(projects):
+        name = PROJECT_NAMES[i % len(PROJECT_NAMES)]
+        if i >= len(PROJECT_NAMES):
+            name = f"{name}（第{i // len(PROJECT_NAMES) + 1}期）"
+        created_at = now - timedelta(days=rng.uniform(0, days))
+        project_rows.append({
+            'id': project_start + i,
+            'name': name,
+            'description': f"{name}相关的文章合集。",
+            'created_at': created_at,
+            'updated_at': created_at,
+        })
+    if project_rows:
+        db.session.execute(Project.__table__.insert(), project_rows)
+        db.session.commit()
+    counts['projects'] = len(project_rows)
+    project_cum_weights = zipf_cum_weights(len(project_rows))
+
+    # 4. 文章及其标签、项目关联和评论，按块插入，每块一个事务
+    article_start = next_id(Article)
+    comment_id = next_id(Comment)
+    render_cache = {}
+    for chunk_start in range(0, articles, chunk_size):
+        chunk_started = time.perf_counter()
+        article_rows, article_tag_rows, project_article_rows, comment_rows = [], [], [], []
+
+        for index in range(chunk_start, min(chunk_start + chunk_size, articles)):
+            article_id = article_start + index
+            title = article_title(index)
+            rendered = rendered_content(index, render_cache)
+            created_at = now - timedelta(seconds=rng.uniform(0, days * 86400))
+            views = view_counts[index]
+
+            program_name = None
+            if project_rows and rng.random() < project_ratio:
+                project = rng.choices(project_rows, cum_weights=project_cum_weights)[0]
+                program_name = project['name']
+                project_article_rows.append({'project_id': project['id'], 'article_id': article_id})
+
+            article_rows.append({
+                'id': article_id,
+                'title': title,
+                'content': ARTICLE_CONTENT.format(title=title),
+                'content_html': rendered['content_html'],
+                'toc': rendered['toc'],
+                'word_count': rendered['word_count'],
+                'excerpt': f"{title}的简要介绍。本文将深入探讨相关技术和实践应用。",
+                'read_time': rng.randint(3, 15),
+                'view_count': views,
+                'like_count': int(views * rng.uniform(0.01, 0.1)),
+                'comment_count': comment_counts[index],
+                'created_at': created_at,
+                'updated_at': created_at,
+                'is_published': rng.random() < publish_ratio,
+                'program_name': program_name,
+            })
+
+            if tag_ids:
+                chosen = set(rng.choices(tag_ids, cum_weights=tag_cum_weights, k=rng.randint(1, 4)))
+                article_tag_rows.extend({'article_id': article_id, 'tag_id': tag_id} for tag_id in chosen)
+
+            for _ in range(comment_counts[index]):
+                author_name = rng.choice(AUTHOR_NAMES)
+                comment_rows.append({
+                    'id': comment_id,
+                    'article_id': article_id,
+                    'author_name': author_name,
+                    'author_email': f"user{rng.randint(1, 99999)}@example.com",
+                    'content': rng.choice(COMMENT_TEMPLATES),
+                    'created_at': created_at + timedelta(seconds=rng.uniform(0, 30 * 86400)),
+                    'is_approved': True,
+                })
+                comment_id += 1
+
+        db.session.execute(Article.__table__.insert(), article_rows)
+        if article_tag_rows:
+            db.session.execute(ArticleTag.__table__.insert(), article_tag_rows)
+        if project_article_rows:
+            db.session.execute(ProjectArticle.__table__.insert(), project_article_rows)
+        if comment_rows:
+            db.session.execute(Comment.__table__.insert(), comment_rows)
+        db.session.commit()
+
+        counts['articles'] += len(article_rows)
+        counts['article_tags'] += len(article_tag_rows)
+        counts['project_articles'] += len(project_article_rows)
+        counts['comments'] += len(comment_rows)
+
+        rows = len(article_rows) + len(article_tag_rows) + len(project_article_rows) + len(comment_rows)
+        elapsed = time.perf_counter() - chunk_started
+        log(f"  文章 {counts['articles']}/{articles}，本块 {rows} 行，{rows / elapsed:,.0f} 行/秒")
+
+    # 5. 重新计算月度归档汇总和标签的文章数
+    archive_service.rebuild()
+    rebuild_counts()
+    db.session.commit()
+
+    elapsed = time.perf_counter() - started
+    total_rows = sum(counts.values())
+    return {
+        'counts': counts,
+        'total_rows': total_rows,
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(total_rows / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成可复现的大规模测试数据')
+    parser.add_argument('--articles', type=int, default=1000, help='文章数（默认1000）')
+    parser.add_argument('--tags', type=int, default=50, help='标签数（默认50）')
+    parser.add_argument('--comments', type=int, default=None, help='评论总数（默认文章数的2倍）')
+    parser.add_argument('--projects', type=int, default=10, help='项目数（默认10）')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子，相同参数和种子生成相同数据')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='每个事务插入的文章数（默认5000）')
+    parser.add_argument('--days', type=int, default=730, help='文章发布时间分布在最近多少天内（默认730）')
+    parser.add_argument('--now', type=datetime.fromisoformat, default=DEFAULT_NOW,
+                        help='时间分布的截止时刻（UTC，ISO格式，默认2025-01-01T00:00:00）')
+    parser.add_argument('--clear', action='store_true', help='生成前清空现有数据')
+    args = parser.parse_args()
+
+    from app import app
+
+    print("开始生成测试数据...")
+    print("=" * 50)
+    with app.app_context():
+        result = generate(
+            articles=args.articles,
+            tags=args.tags,
+            comments=args.comments,
+            projects=args.projects,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+            days=args.days,
+            now=args.now,
+            clear=args.clear,
+        )
+
+    print("\n" + "=" * 50)
+    print("数据生成完成！")
+    for table, count in result['counts'].items():
+        print(f"  {table}: {count}")
+    print(f"  共 {result['total_rows']} 行，耗时 {result['elapsed_seconds']} 秒，{result['rows_per_second']:,.0f} 行/秒")
+
+
+if __name__ == "__main__":
+    main()
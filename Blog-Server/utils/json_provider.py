@@ -0,0 +1,51 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时使用标准库json
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """基于orjson的JSON序列化，输出与DefaultJSONProvider一致（键排序、日期为HTTP日期格式）
+
+    orjson直接输出UTF-8，不转义非ASCII字符。传入标准库专用的参数，或遇到orjson不支持的值
+    （如超出64位的整数）时退回到标准库json。
+    """
+
+    def _option(self, indent=False):
+        # datetime交给default按HTTP日期格式输出，与标准库实现保持一致
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _dumps_bytes(self, obj, indent=False):
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._option(indent))
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self._dumps_bytes(obj, indent) + b'\n', mimetype=self.mimetype)
+
+
+def json_provider_for(app):
+    """按JSON_USE_ORJSON配置和orjson是否安装，返回应用使用的JSON provider"""
+    if orjson is not None and app.config.get('JSON_USE_ORJSON', True):
+        return OrjsonProvider(app)
+    return DefaultJSONProvider(app)
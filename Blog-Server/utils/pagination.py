@@ -0,0 +1,34 @@
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at, article_id):
+    """把最后一条记录的(created_at, id)编码成不透明的游标字符串"""
+    raw = f'{created_at.isoformat()}|{article_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """解析游标，返回(created_at, id)；格式错误时抛出ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, article_id = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(article_id)
+    except (TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError('无效的分页游标') from e
+
+
+def seek_after(created_at_column, id_column, cursor):
+    """按(created_at, id)降序排列时，定位到游标之后记录的查询条件"""
+    created_at, article_id = decode_cursor(cursor)
+    return seek_after_row(created_at_column, id_column, created_at, article_id)
+
+
+def seek_after_row(created_at_column, id_column, created_at, article_id):
+    """按(created_at, id)降序排列时，定位到指定记录之后的查询条件"""
+    return or_(
+        created_at_column < created_at,
+        and_(created_at_column == created_at, id_column < article_id)
+    )
@@ -0,0 +1,14 @@
+from flask import current_app, jsonify
+
+
+def format_size(size):
+    """字节数 -> 便于阅读的大小：不足1MB时以KB为单位，否则以MB为单位并保留一位小数"""
+    if size < 1024 * 1024:
+        return f'{max(round(size / 1024), 1)}KB'
+    return f'{size / (1024 * 1024):.1f}'.removesuffix('.0') + 'MB'
+
+
+def request_too_large_response():
+    """请求体超过MAX_CONTENT_LENGTH（Werkzeug抛出RequestEntityTooLarge）时返回的413响应"""
+    limit = format_size(current_app.config['MAX_CONTENT_LENGTH'])
+    return jsonify({'error': f'请求体大小不能超过 {limit}'}), 413
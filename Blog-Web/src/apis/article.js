@@ -7,9 +7,9 @@ export const articleService = {
     return api.get('/article/get-page', { params })
   },
   
-  // 获取所有文章（不分页，用于归档页面）
-  getAllArticles() {
-    return api.get('/article/all-articles')
+  // 获取所有文章（不分页，用于归档页面；fields可以只取需要的字段）
+  getAllArticles(params = {}) {
+    return api.get('/article/all-articles', { params })
   },
   
   // 获取单篇文章
@@ -7,9 +7,9 @@ export const programService = {
     return api.get('/program/get-all')
   },
   
-  // 获取单个项目详情
-  getProject(id) {
-    return api.get(`/program/single/${id}`)
+  // 获取单个项目详情（关联文章分页返回：page、per_page、include_content）
+  getProject(id, params = {}) {
+    return api.get(`/program/single/${id}`, { params })
   },
   
   // 创建项目
@@ -47,6 +47,12 @@ export const programService = {
   // 从项目中移除文章
   removeArticleFromProject(projectId, articleId) {
     return api.delete(`/program/${projectId}/remove-article/${articleId}`)
+  },
+
+  // 项目图片的srcset（kind为webp或fallback），后台尚未生成缩放版本时返回空字符串
+  imageSrcset(project, kind = 'webp') {
+    const variants = project.image_variants?.[kind] || []
+    return variants.map(item => `${item.url} ${item.width}w`).join(', ')
   }
 }
 